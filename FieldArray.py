@@ -0,0 +1,257 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from FiniteFields import FiniteField, FieldElement
+
+
+class FieldArray:
+    """Arrays of elements of a finite field F(p^n) with vectorized
+    arithmetic. Requires NumPy.
+
+    The N elements are stored as an (N, n) integer array of coordinates over
+    F_p, in the same order as FieldElement.digits(). Elementwise +, -, *, /
+    and ** as well as dot products are computed for the whole array at once:
+    products by convolution of the coordinate rows followed by a matrix
+    product with the reduction table of the field, and division and powers
+    through the log tables when the field has them.
+    """
+
+    def __init__(self, field: FiniteField, data):
+        """
+        Creates an array from a list of FieldElement objects or from an
+        (N, n) array of coordinates
+        """
+        if np is None:
+            raise ImportError("FieldArray requires NumPy")
+        self.field = field
+        self.dtype = _coordinate_dtype(field)
+        if isinstance(data, np.ndarray):
+            coords = np.array(data, dtype=self.dtype) % field.characteristic
+        else:
+            coords = np.array([_digits(field, e) for e in data],
+                              dtype=self.dtype)
+        self.coords = coords.reshape(-1, field.degree)
+
+    @classmethod
+    def from_integers(cls, field: FiniteField, values):
+        """Creates an array from the packed integer representations of its
+        elements
+        """
+        if np is None:
+            raise ImportError("FieldArray requires NumPy")
+        dtype = _coordinate_dtype(field)
+        values = np.array(values, dtype=dtype).reshape(-1, 1)
+        coords = (values // _powers(field, dtype)) % field.characteristic
+        return cls(field, coords)
+
+    @classmethod
+    def zeros(cls, field: FiniteField, length: int):
+        """Returns an array of 'length' zeros
+        """
+        if np is None:
+            raise ImportError("FieldArray requires NumPy")
+        return cls(field, np.zeros((length, field.degree),
+                                   dtype=_coordinate_dtype(field)))
+
+    def __str__(self):
+        return "[" + ", ".join(str(e) for e in self) + "]"
+
+    def __repr__(self):
+        return f"FieldArray({self.field}, {len(self)})"
+
+    def __len__(self):
+        return self.coords.shape[0]
+
+    def __iter__(self):
+        return iter(self.to_elements())
+
+    def __getitem__(self, i):
+        if isinstance(i, (int, np.integer)):
+            return FieldElement(self.field, int(self.to_integers()[i]))
+        return FieldArray(self.field, self.coords[i])
+
+    def to_integers(self):
+        """Returns the packed integer representations of the elements as a
+        one dimensional array
+        """
+        return self.coords @ _powers(self.field, self.dtype)
+
+    def to_elements(self) -> list:
+        """Returns the elements as a list of FieldElement objects
+        """
+        return [FieldElement(self.field, int(v)) for v in self.to_integers()]
+
+    def __add__(self, other):
+        other = self._coerce(other)
+        return self._new((self.coords + other) % self.field.characteristic)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        other = self._coerce(other)
+        return self._new((self.coords - other) % self.field.characteristic)
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __neg__(self):
+        return self._new(-self.coords % self.field.characteristic)
+
+    def __mul__(self, other):
+        other = self._coerce(other)
+        tables = self._tables()
+        if tables is not None:
+            log, exp = tables
+            a = self.to_integers()
+            b = self._new(np.broadcast_to(other, self.coords.shape)
+                          ).to_integers()
+            nonzero = (a != 0) & (b != 0)
+            product = np.where(nonzero, exp[log[a] + log[b]], 0)
+            return FieldArray.from_integers(self.field, product)
+        return self._new(_multiply(self.field, self.coords, other))
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def __truediv__(self, other):
+        if not isinstance(other, FieldArray):
+            other = self._new(np.broadcast_to(self._coerce(other),
+                                              self.coords.shape))
+        return self * other.inverse()
+
+    def __rtruediv__(self, other):
+        return self.inverse() * other
+
+    def __pow__(self, other):
+        if not isinstance(other, int):
+            raise TypeError("Other needs to be int")
+        order = self.field.size() - 1
+        zero = ~self.coords.any(axis=1)
+        if other < 0 and zero.any():
+            raise ZeroDivisionError("Zero has no inverse")
+        if other == 0:
+            return self._new(_identity_coords(self.field, len(self),
+                                              self.dtype))
+        exponent = other % order
+
+        tables = self._tables()
+        if tables is not None:
+            log, exp = tables
+            a = self.to_integers()
+            power = np.where(zero, 0, exp[(log[a]*exponent) % order])
+            return FieldArray.from_integers(self.field, power)
+
+        result = _identity_coords(self.field, len(self), self.dtype)
+        base = self.coords
+        while exponent:
+            if exponent & 1:
+                result = _multiply(self.field, result, base)
+            base = _multiply(self.field, base, base)
+            exponent >>= 1
+        result[zero] = 0
+        return self._new(result)
+
+    def inverse(self):
+        """Returns the array of inverses of the elements
+        """
+        if not self.coords.any(axis=1).all():
+            raise ZeroDivisionError("Zero has no inverse")
+        return self ** -1
+
+    def sum(self) -> FieldElement:
+        """Returns the sum of all elements
+        """
+        coords = self.coords.sum(axis=0) % self.field.characteristic
+        return FieldElement(self.field, [int(i) for i in coords])
+
+    def dot(self, other) -> FieldElement:
+        """Returns the sum of the elementwise products of the two arrays
+        """
+        return (self * other).sum()
+
+    def __eq__(self, other):
+        other = self._coerce(other)
+        return (self.coords == other).all(axis=1)
+
+    def _new(self, coords):
+        return FieldArray(self.field, coords)
+
+    def _coerce(self, other):
+        """Returns the coordinates of the other operand, which may be an
+        array of the same length or a single element
+        """
+        if isinstance(other, FieldArray):
+            if other.field is not self.field:
+                raise ValueError("Elements are from different fields")
+            if len(other) != len(self):
+                raise ValueError("Arrays must be of same length")
+            return other.coords
+        if isinstance(other, int) and other in (0, 1):
+            other = self.field.identity() if other else self.field.zero()
+        if isinstance(other, FieldElement):
+            if other.field is not self.field:
+                raise ValueError("Elements are from different fields")
+            return np.array(other.digits(), dtype=self.dtype)
+        raise TypeError("Other must be FieldArray or FieldElement")
+
+    def _tables(self):
+        """Returns the log tables of the field as arrays, or None
+        """
+        if self.field not in _array_tables:
+            tables = self.field.log_tables()
+            if tables is not None:
+                log, exp = tables
+                tables = (np.array([0 if i is None else i for i in log]),
+                          np.array(exp))
+            _array_tables[self.field] = tables
+        return _array_tables[self.field]
+
+
+# Log tables of each field converted to NumPy arrays
+_array_tables = {}
+
+
+def _coordinate_dtype(field: FiniteField):
+    """Uses int64 when a full convolution followed by the reduction matrix
+    product cannot overflow, and Python integers otherwise
+    """
+    bound = 2*field.degree*(field.characteristic - 1)**2
+    if bound < 2**62 and field.size() < 2**62:
+        return np.int64
+    return object
+
+def _powers(field: FiniteField, dtype):
+    p = field.characteristic
+    return np.array([p**i for i in range(field.degree)], dtype=dtype)
+
+def _identity_coords(field: FiniteField, length: int, dtype):
+    coords = np.zeros((length, field.degree), dtype=dtype)
+    coords[:, 0] = 1
+    return coords
+
+def _digits(field: FiniteField, element) -> list:
+    if not isinstance(element, FieldElement):
+        element = field(element)
+    elif element.field is not field:
+        raise ValueError("Elements are from different fields")
+    return element.digits()
+
+def _multiply(field: FiniteField, a, b):
+    """Multiplies coordinate arrays row by row: convolution of the rows,
+    then reduction of the high part with the field's reduction table
+    """
+    n = field.degree
+    p = field.characteristic
+    a, b = np.broadcast_arrays(a, b)
+    product = np.zeros((a.shape[0], 2*n - 1), dtype=a.dtype)
+    for i in range(n):
+        product[:, i:i+n] += a[:, i:i+1]*b
+    product %= p
+    if n == 1:
+        return product
+    # The cached table may hold rows for longer vectors than a product
+    table = np.array(field.reduction_table(2*n - 1)[:n - 1], dtype=a.dtype)
+    return (product[:, :n] + product[:, n:] @ table) % p
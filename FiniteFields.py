@@ -1,75 +1,452 @@
-from finitefield_functions import ALWAYS_REDUCE, isPrime
+from itertools import chain
+
+from finitefield_functions import isPrime, int_to_digits, digits_to_int, \
+                                  factor, \
+                                  LOG_TABLE_MAX_SIZE, NEWTON_DIVISION_THRESHOLD
 from IntegersModP import IntegersMod
-from irred_poly_finder import modulo_method
-from Matrix import identity_matrix, Matrix
+from binary_functions import BinaryModulus, binary_inverse, clsquare
+from defining_polys import default_modulus, named_modulus
+from irred_poly_finder import find_irreducible
+from Polynomial import Polynomial
+from polynomial_functions import poly_mul, poly_scale, poly_inverse_mod, \
+                                 poly_trim, poly_is_irreducible, \
+                                 frobenius_rows, apply_frobenius
 
 class FiniteField:
     """The finite field with p^n elements, where p is a prime
+
+    Fields are interned: FiniteField(p, n) always returns the same context
+    object for a given (p, n), so the defining polynomial and the reduction
+    tables are only computed once and shared by all elements of the field.
+    A field with an explicit modulus is interned by (p, n, modulus).
     """
 
-    def __init__(self, base_prime, degree):
+    _fields = {}
+
+    def __new__(cls, base_prime, degree, modulus=None):
         """
         Creates the finite field with base_prime**degree elements
+
+        'modulus' is the defining polynomial, given as a Polynomial, a list
+        of integer coefficients a_0 first or the name of a modulus in
+        defining_polys.NAMED_MODULI. It must be irreducible of degree
+        'degree' and is made monic. Without it, the modulus registered in
+        defining_polys is used, or one found by find_irreducible.
         """
+        key = (base_prime, degree)
+        if modulus is not None:
+            coeffs = _modulus_coeffs(modulus, base_prime, degree)
+            if coeffs != default_modulus(base_prime, degree):
+                key = (base_prime, degree, tuple(coeffs))
+        field = cls._fields.get(key)
+        if field is not None:
+            return field
+
         if not isPrime(base_prime):
             raise ValueError(f"Base number {base_prime} must be prime")
         if degree != 0 and not isinstance(degree, int):
             raise ValueError(f"Degree {degree} must be postive integer")
-        self.characteristic = base_prime
-        self.degree = degree
+        field = super().__new__(cls)
+        field.characteristic = base_prime
+        field.degree = degree
+        field.base_field = IntegersMod(base_prime)
+        field._size = base_prime ** degree
+        field._modulus = None
+        if len(key) == 3:
+            if not poly_is_irreducible(coeffs, base_prime):
+                raise ValueError(f"Modulus must be irreducible over "
+                                 f"F_{base_prime}")
+            field._modulus = Polynomial([field.base_field(i)
+                                         for i in coeffs])
+        field._reduction_table = []
+        field._sparse_terms = None
+        field._log_tables = None
+        field._precomputed_modulus = None
+        field._binary_modulus = None
+        field._frobenius_rows = None
+        field._trace_vector = None
+        field._order_factors = None
+        field._primitive_element = None
+        cls._fields[key] = field
+        return field
 
     def __str__(self):
         return f"F({self.characteristic}^{self.degree})"
 
+    def __repr__(self):
+        return str(self)
+
+    def __reduce__(self):
+        key = (self.characteristic, self.degree)
+        if FiniteField._fields.get(key) is self:
+            return (FiniteField, key)
+        return (FiniteField, key + ([i.value for i in self._modulus.coeffs],))
+
     def irred_poly(self):
         """Returns the polynomial used to define the relation between
         field elements
+
+        Unless given when the field was created, the polynomial is taken
+        from the registry in defining_polys, or found with find_irreducible
+        if none is registered, the first time it is needed. It is cached on
+        the field afterwards.
+        """
+        if self._modulus is None:
+            prime = self.characteristic
+            coeffs = default_modulus(prime, self.degree)
+            if coeffs is None:
+                self._modulus = find_irreducible(prime, self.degree)
+            else:
+                self._modulus = Polynomial([self.base_field(i)
+                                            for i in coeffs])
+        return self._modulus
+
+    def sparse_terms(self):
+        """Returns the pairs (i, -f_i mod p) for the nonzero coefficients
+        f_i below the leading term of the defining polynomial f, or None if
+        f has too many terms for shift-and-add reduction to pay off
+        """
+        if self._sparse_terms is None:
+            prime = self.characteristic
+            terms = [(i, -c.value % prime) for i, c
+                     in enumerate(self.irred_poly().coeffs[:self.degree])
+                     if c.value % prime]
+            self._sparse_terms = terms if 2*len(terms) <= self.degree \
+                                 else False
+        return self._sparse_terms or None
+
+    def reduction_table(self, length):
+        """Returns the rows x^(n+k) mod f(x) for k < length - n, where f is
+        the defining polynomial of degree n
+
+        Row k holds the integer coefficients of x^(n+k) reduced modulo f, so
+        an unreduced vector is reduced by adding its k-th excess coefficient
+        times row k. Rows are computed on demand and cached.
+        """
+        deg = self.degree
+        prime = self.characteristic
+        table = self._reduction_table
+        if not table and length > deg:
+            table.append([-i.value % prime
+                          for i in self.irred_poly().coeffs[:deg]])
+        while len(table) < length - deg:
+            previous = table[-1]
+            row = [0] + previous[:-1]
+            for i in range(deg):
+                row[i] = (row[i] + previous[-1]*table[0][i]) % prime
+            table.append(row)
+        return table
+
+    def reduce_vector(self, vector: list) -> int:
+        """Reduces a list of integer coefficients modulo the defining
+        polynomial and returns the packed representation of the result
+
+        Sparse defining polynomials reduce by shift-and-add, one pass over
+        the excess coefficients per term. Otherwise small degrees use the
+        reduction table and large degrees a PrecomputedModulus for the
+        defining polynomial.
+        """
+        deg = self.degree
+        prime = self.characteristic
+        if len(vector) <= deg:
+            return digits_to_int([i % prime for i in vector], prime)
+        terms = self.sparse_terms()
+        if terms is not None:
+            reduced = vector[:]
+            for k in range(len(reduced) - 1, deg - 1, -1):
+                coeff = reduced[k] % prime
+                if coeff:
+                    shift = k - deg
+                    for i, c in terms:
+                        reduced[shift + i] += coeff*c
+            return digits_to_int([i % prime for i in reduced[:deg]], prime)
+        if deg >= NEWTON_DIVISION_THRESHOLD:
+            if self._precomputed_modulus is None:
+                self._precomputed_modulus = self.irred_poly().modulus()
+            return digits_to_int(self._precomputed_modulus.reduce(
+                [i % prime for i in vector]), prime)
+
+        table = self.reduction_table(len(vector))
+        reduced = vector[:deg]
+        for k in range(len(vector) - deg):
+            coeff = vector[deg + k]
+            if coeff == 0:
+                continue
+            row = table[k]
+            for i in range(deg):
+                reduced[i] += coeff*row[i]
+        return digits_to_int([i % prime for i in reduced], prime)
+
+    def binary_modulus(self):
+        """Returns the defining polynomial of a field of characteristic 2
+        as a BinaryModulus, packed into an integer like the elements
+        """
+        if self._binary_modulus is None:
+            self._binary_modulus = BinaryModulus(digits_to_int(
+                [i.value for i in self.irred_poly().coeffs], 2))
+        return self._binary_modulus
+
+    def multiply(self, value1: int, value2: int) -> int:
+        """Multiplies two packed field values by polynomial multiplication
+        followed by reduction, without using the log tables
+
+        For p = 2 the packed values are multiplied directly as carry-less
+        integer products.
+        """
+        prime = self.characteristic
+        if prime == 2:
+            return self.binary_modulus().multiply(value1, value2)
+        product = poly_mul(int_to_digits(value1, prime),
+                           int_to_digits(value2, prime), prime)
+        return self.reduce_vector(product)
+
+    def power(self, value: int, exponent: int) -> int:
+        """Raises a packed field value to a nonnegative power by sliding
+        window exponentiation, without using the log tables
+
+        The odd powers value^1, value^3, ..., value^(2^w - 1) are computed
+        first, then every run of at most w bits of the exponent ending in a
+        1 costs one multiplication besides the squarings.
+        """
+        bits = exponent.bit_length()
+        if bits == 0:
+            return 1
+        multiply = self.multiply
+        width = max(1, min(6, bits.bit_length() // 2))
+        odd_powers = [value]
+        if width > 1:
+            square = multiply(value, value)
+            for _ in range(2**(width - 1) - 1):
+                odd_powers.append(multiply(odd_powers[-1], square))
+
+        result = None
+        i = bits - 1
+        while i >= 0:
+            if not exponent >> i & 1:
+                result = multiply(result, result)
+                i -= 1
+                continue
+            j = max(i - width + 1, 0)
+            while not exponent >> j & 1:
+                j += 1
+            window = exponent >> j & ((1 << (i - j + 1)) - 1)
+            if result is None:
+                result = odd_powers[window >> 1]
+            else:
+                for _ in range(i - j + 1):
+                    result = multiply(result, result)
+                result = multiply(result, odd_powers[window >> 1])
+            i = j - 1
+        return result
+
+    def frobenius_rows(self):
+        """Returns the rows x^(ip) mod f for i < n as integer coefficient
+        lists, so that raising to the power p is a linear map
         """
+        if self._frobenius_rows is None:
+            self._frobenius_rows = frobenius_rows(self.irred_poly().modulus())
+        return self._frobenius_rows
+
+    def frobenius(self, value: int, k: int = 1) -> int:
+        """Returns a packed field value raised to the power p^k
+
+        Uses the log tables when the field has them, squaring for p = 2 and
+        the Frobenius rows otherwise, so no exponentiation is done.
+        """
+        k %= self.degree
+        if k == 0 or value == 0:
+            return value
         prime = self.characteristic
-        irred_polys = modulo_method(self.degree, IntegersMod(prime))
-        return irred_polys[-1]
+        tables = self.log_tables()
+        if tables is not None:
+            log, exp = tables
+            return exp[log[value]*prime**k % (self._size - 1)]
+        if prime == 2:
+            modulus = self.binary_modulus()
+            for _ in range(k):
+                value = modulus.reduce(clsquare(value))
+            return value
+        rows = self.frobenius_rows()
+        digits = int_to_digits(value, prime)
+        for _ in range(k):
+            digits = apply_frobenius(digits, rows, prime)
+        return digits_to_int(digits, prime)
+
+    def trace_vector(self):
+        """Returns the traces Tr(ω^i) for i < n, where ω is a root of the
+        defining polynomial, as integers modulo p
+
+        These are the power sums of the roots of the defining polynomial
+        and follow from its coefficients by Newton's identities.
+        """
+        if self._trace_vector is None:
+            prime = self.characteristic
+            deg = self.degree
+            coeffs = [i.value for i in self.irred_poly().coeffs]
+            sums = [deg % prime]
+            for k in range(1, deg):
+                total = k*coeffs[deg - k]
+                for i in range(1, k):
+                    total += coeffs[deg - i]*sums[k - i]
+                sums.append(-total % prime)
+            self._trace_vector = sums
+        return self._trace_vector
+
+    def log_tables(self):
+        """Returns the pair (log, exp) of discrete logarithm and antilog
+        tables with respect to a primitive element, or None if the field has
+        more than LOG_TABLE_MAX_SIZE elements
+
+        The tables are indexed by packed values and built the first time
+        they are needed. exp has length 2(q-1), so a sum of two logarithms
+        can be looked up without reducing it modulo q-1.
+        """
+        if self._log_tables is None:
+            if self._size > LOG_TABLE_MAX_SIZE:
+                self._log_tables = False
+            else:
+                self._log_tables = self._build_log_tables()
+        return self._log_tables or None
+
+    def _build_log_tables(self):
+        generator = self.primitive_element().value
+        exp = [1]
+        power = generator
+        while power != 1:
+            exp.append(power)
+            power = self.multiply(power, generator)
+        log = [None]*self._size
+        for i, value in enumerate(exp):
+            log[value] = i
+        return log, exp + exp
+
+    def order_factors(self):
+        """Returns the prime factorization {prime: exponent} of q - 1, the
+        order of the multiplicative group, computed once per field
+        """
+        if self._order_factors is None:
+            self._order_factors = factor(self._size - 1)
+        return self._order_factors
+
+    def is_primitive_value(self, value: int) -> bool:
+        """Returns True if the packed value generates the multiplicative
+        group, that is value^((q-1)/r) != 1 for every prime r dividing q-1
+        """
+        if value == 0:
+            return False
+        order = self._size - 1
+        return all(self.power(value, order // r) != 1
+                   for r in self.order_factors())
+
+    def primitive_element(self):
+        """Returns a generator of the multiplicative group of the field
+
+        The root ω of the defining polynomial is tried first, then the
+        packed values in increasing order. The result is cached.
+        """
+        if self._primitive_element is None:
+            candidates = range(1, self._size)
+            if self.degree > 1:
+                candidates = chain([self.characteristic], candidates)
+            for value in candidates:
+                if self.is_primitive_value(value):
+                    self._primitive_element = _element(self, value)
+                    break
+        return self._primitive_element
+
+    def inverse_many(self, elements: list) -> list:
+        """Returns the inverses of all elements in the list
+
+        Uses Montgomery's trick: one inversion of the product of all
+        elements and 3(k-1) multiplications for k elements.
+        """
+        if not elements:
+            return []
+        prefix = [elements[0]]
+        for element in elements[1:]:
+            prefix.append(prefix[-1] * element)
+        inverse = prefix[-1].inverse()
+        inverses = [None]*len(elements)
+        for i in range(len(elements) - 1, 0, -1):
+            inverses[i] = inverse * prefix[i-1]
+            inverse = inverse * elements[i]
+        inverses[0] = inverse
+        return inverses
 
     def size(self):
         """Returns the size of the field"""
-        return self.characteristic ** self.degree
+        return self._size
     
-    def __call__(self, vector: list):
-        return FieldElement(self.characteristic, self.degree, vector)
+    def __call__(self, vector):
+        return FieldElement(self, vector)
     
     def identity(self):
         """Returns the identity element of the field
         """
-        return self([1])
+        return _element(self, 1)
     
     def zero(self):
         """Retruns the zero element of the field
         """
-        return self([0])
+        return _element(self, 0)
         
 
-class FieldElement(FiniteField):
+class FieldElement:
     """
     Field elements are regarded as vectors over the base field F_{base_prime}
+
+    The vector is stored packed into a single integer 'value', whose base p
+    digits are the coordinates (least significant first). Every element
+    keeps a reference to the FiniteField it belongs to, which holds the
+    defining polynomial and reduction tables. Elements are always stored
+    reduced.
     """
 
-    def __init__(self, base_prime, degree, vector):
-        super().__init__(base_prime, degree)
+    __slots__ = ("field", "value")
 
-        if isinstance(vector[0], int):
-            base_field = IntegersMod(base_prime)
-            vector = [base_field(i) for i in vector]
-        self.vector = vector
+    def __init__(self, field: FiniteField, vector):
+        """
+        Creates a field element from a list of coordinates (integers or
+        IntegersModElement) or from its packed integer representation
+        """
+        self.field = field
+        if isinstance(vector, int):
+            if not 0 <= vector < field._size:
+                raise ValueError(f"Packed value {vector} is not in {field}")
+            self.value = vector
+            return
+        self.value = field.reduce_vector(
+            [i if isinstance(i, int) else i.value for i in vector])
+
+    @property
+    def characteristic(self):
+        return self.field.characteristic
+
+    @property
+    def degree(self):
+        return self.field.degree
+
+    @property
+    def vector(self):
+        """The coordinates of the element as IntegersModElement objects
+        """
+        base_field = self.field.base_field
+        return [base_field(i) for i in self.digits()]
+
+    def digits(self):
+        """Returns the coordinates of the element as a list of integers
+        """
+        return int_to_digits(self.value, self.characteristic, self.degree)
 
     def __str__(self):
-        self.reduce_element()
         def to_superscript(n):
             superscript_digits = '⁰¹²³⁴⁵⁶⁷⁸⁹'
             return ''.join(superscript_digits[int(digit)] for digit in str(n))
         
-        if self == super().zero():
+        if self.value == 0:
             return "0"
         
-        coeffs = [i.value if i!=0 else 0 for i in self.vector]
+        coeffs = self.digits()
         root_terms = []
         for degree in range(len(coeffs)):
             coef = coeffs[degree]
@@ -91,134 +468,322 @@ class FieldElement(FiniteField):
         
         return "".join(root_terms)
 
+    def __repr__(self):
+        return str(self)
+
+    def __hash__(self):
+        # Consistent with equality to the integers 0 and 1
+        return hash(self.value)
+
     def __call__(self, vector):
-        return super().__call__(vector)
+        return self.field(vector)
     
     def __getitem__(self, i):
-        if i >= self.len():
+        if i >= self.degree:
             return 0
-        return self.vector[i]
+        return self.field.base_field(
+            self.value // self.characteristic**i % self.characteristic)
 
     def __add__(self, other):
-        if other == 0:
+        if isinstance(other, int) and other == 0:
             return self
         _compare_class(self, other)
-        length = max(self.len(), other.len())
-        return FieldElement(self.characteristic, self.degree,
-                [(self[i] + other[i]) for i in range(length)]
-                ).reduce_element()
+        prime = self.characteristic
+        if prime == 2:
+            return _element(self.field, self.value ^ other.value)
+        digits = int_to_digits(self.value, prime, self.degree)
+        other_digits = int_to_digits(other.value, prime, self.degree)
+        return _element(self.field, digits_to_int(
+            [(i + j) % prime for i, j in zip(digits, other_digits)], prime))
     
     def __radd__(self, other):
         return self.__add__(other)
     
     def __sub__(self, other):
-        if other == 0:
+        if isinstance(other, int) and other == 0:
             return self
         _compare_class(self, other)
-        length = max(self.len(), other.len())
-        return FieldElement(self.characteristic, self.degree,
-                [(self[i] - other[i]) for i in range(length)]
-                ).reduce_element()
+        prime = self.characteristic
+        if prime == 2:
+            return _element(self.field, self.value ^ other.value)
+        digits = int_to_digits(self.value, prime, self.degree)
+        other_digits = int_to_digits(other.value, prime, self.degree)
+        return _element(self.field, digits_to_int(
+            [(i - j) % prime for i, j in zip(digits, other_digits)], prime))
     
     def __mul__(self, other):
-        if other == 0:
-            return super().zero()
-        if other == 1:
-            return self
+        if isinstance(other, int):
+            if other == 0:
+                return self.field.zero()
+            if other == 1:
+                return self
         _compare_class(self, other)
-        tmp_vector = [0]*(self.len()+other.len())
-        self.reduce_element()
-        other.reduce_element()
-        for i in range(self.len()):
-            for j in range(other.len()):
-                tmp_vector[i+j] += self[i]*other[j]
-        return FieldElement(self.characteristic, self.degree,
-                            tmp_vector).reduce_element()
+        tables = self.field.log_tables()
+        if tables is None:
+            return _element(self.field,
+                            self.field.multiply(self.value, other.value))
+        if self.value == 0 or other.value == 0:
+            return self.field.zero()
+        log, exp = tables
+        return _element(self.field, exp[log[self.value] + log[other.value]])
     
     def __rmul__(self, other):
         return self.__mul__(other)
     
     def inverse(self):
         """Returns the inverse of the field element
+
+        Uses the log tables for small fields and the extended Euclidean
+        algorithm against the defining polynomial otherwise, on packed
+        integers for p = 2.
         """
-        if self == 0:
+        if self.value == 0:
             raise ZeroDivisionError("Zero has no inverse")
-        
-        char = self.characteristic
-        deg = self.degree
-        field = FiniteField(char, deg)
-        transition_matrix_prod = 1
-        for i in range(deg-1):
-            transition_matrix_prod = _transition_matrix(i, field) \
-                                    * transition_matrix_prod
-        TA = (_element_to_matrix(self)*transition_matrix_prod).transpose()
-        return field(TA.solve([IntegersMod(char).identity(), 
-                               IntegersMod(char).zero(),
-                               IntegersMod(char).zero()]))
+        field = self.field
+        tables = field.log_tables()
+        if tables is not None:
+            log, exp = tables
+            return _element(field, exp[field._size-1 - log[self.value]])
+
+        prime = self.characteristic
+        if prime == 2:
+            return _element(field, binary_inverse(
+                self.value, field.binary_modulus().f))
+        modulus = [i.value for i in field.irred_poly().coeffs]
+        inverse = poly_inverse_mod(self.digits(), modulus, prime)
+        return _element(field, digits_to_int(inverse, prime))
+
+    def itoh_tsujii_inverse(self):
+        """Returns the inverse of the field element by the Itoh-Tsujii
+        algorithm
+
+        With r = (q-1)/(p-1), a^r lies in the base field, so
+        a^(-1) = a^(r-1) * (a^r)^(-1).
+        """
+        if self.value == 0:
+            raise ZeroDivisionError("Zero has no inverse")
+        field = self.field
+        prime = self.characteristic
+        if self.degree == 1:
+            return _element(field, pow(self.value, -1, prime))
+        power = self._norm_cofactor()
+        norm = (self * power).value
+        return _element(field, digits_to_int(
+            poly_scale(power.digits(), pow(norm, -1, prime), prime), prime))
+
+    def _norm_cofactor(self):
+        """Returns a^(r-1) with r = (q-1)/(p-1), from Frobenius maps with an
+        addition chain on n-1, using O(log n) multiplications
+        """
+        # beta_k = a^(1 + p + ... + p^(k-1))
+        m = self.degree - 1
+        beta = self
+        k = 1
+        for bit in bin(m)[3:]:
+            beta = beta.frobenius(k) * beta
+            k *= 2
+            if bit == "1":
+                beta = beta.frobenius(1) * self
+                k += 1
+        return beta.frobenius(1)
+
+    def multiplicative_order(self) -> int:
+        """Returns the order of the element in the multiplicative group
+
+        Starting from q - 1, each prime factor r is divided out as long as
+        the element raised to the remaining order over r is still 1, which
+        takes O(number of prime factors of q - 1) exponentiations.
+        """
+        if self.value == 0:
+            raise ZeroDivisionError("Zero has no multiplicative order")
+        order = self.field._size - 1
+        for r, e in self.field.order_factors().items():
+            for _ in range(e):
+                if self ** (order // r) != 1:
+                    break
+                order //= r
+        return order
+
+    def is_primitive(self) -> bool:
+        """Returns True if the element generates the multiplicative group
+        """
+        return self.field.is_primitive_value(self.value)
+
+    def frobenius(self, k: int = 1):
+        """Returns the element raised to the power p^k
+        """
+        return _element(self.field, self.field.frobenius(self.value, k))
+
+    def trace(self):
+        """Returns the trace a + a^p + ... + a^(p^(n-1)) as an element of
+        the base field
+        """
+        return self.field.base_field(sum(
+            i*t for i, t in zip(self.digits(), self.field.trace_vector())))
+
+    def norm(self):
+        """Returns the norm a * a^p * ... * a^(p^(n-1)) as an element of the
+        base field
+        """
+        base_field = self.field.base_field
+        if self.value == 0 or self.degree == 1:
+            return base_field(self.value)
+        return base_field((self * self._norm_cofactor()).value)
+
+    def minimal_polynomial(self):
+        """Returns the minimal polynomial of the element over the base field,
+        the product of x - c over its distinct conjugates c
+        """
+        conjugates = [self]
+        conjugate = self.frobenius(1)
+        while conjugate != self:
+            conjugates.append(conjugate)
+            conjugate = conjugate.frobenius(1)
+        coeffs = [self.field.identity()]
+        for conjugate in conjugates:
+            shifted = [self.field.zero()] + coeffs
+            for i, coeff in enumerate(coeffs):
+                shifted[i] = shifted[i] - conjugate*coeff
+            coeffs = shifted
+        base_field = self.field.base_field
+        return Polynomial([base_field(i.value) for i in coeffs])
+
+    def is_square(self):
+        """Returns True if the element is a square in the field
+
+        For odd p, a is a square exactly when its norm is a square in F_p.
+        """
+        prime = self.characteristic
+        if prime == 2 or self.value == 0:
+            return True
+        return pow(self.norm().value, (prime - 1) // 2, prime) == 1
+
+    def sqrt(self):
+        """Returns a square root of the element
+
+        For p = 2 this is the Frobenius map a^(2^(n-1)), and otherwise the
+        Tonelli-Shanks algorithm. Raises ValueError for non-squares.
+        """
+        field = self.field
+        if self.characteristic == 2:
+            return self.frobenius(self.degree - 1)
+        if self.value == 0:
+            return self
+        if not self.is_square():
+            raise ValueError(f"{self} is not a square in {field}")
+        order = field._size - 1
+        if order % 4 == 2:
+            return self ** ((order + 2) // 4)
+
+        s = (order & -order).bit_length() - 1
+        t = order >> s
+        value = 2
+        while field(value).is_square():
+            value += 1
+        c = field(value) ** t
+        x = self ** ((t + 1) // 2)
+        b = self ** t
+        while b != 1:
+            i = 1
+            b2 = b * b
+            while b2 != 1:
+                b2 = b2 * b2
+                i += 1
+            d = c ** (2**(s - i - 1))
+            x = x * d
+            c = d * d
+            b = b * c
+            s = i
+        return x
 
     def __truediv__(self, other):
         _compare_class(self, other)
-        return self * other.inverse()
+        tables = self.field.log_tables()
+        if tables is None:
+            return self * other.inverse()
+        if other.value == 0:
+            raise ZeroDivisionError("Division by zero")
+        if self.value == 0:
+            return self
+        log, exp = tables
+        return _element(self.field, exp[log[self.value] - log[other.value]
+                                        + self.field._size-1])
+
+    def __pow__(self, other):
+        if not isinstance(other, int):
+            raise TypeError("Other needs to be int")
+        if self.value == 0:
+            if other < 0:
+                raise ZeroDivisionError("Zero has no inverse")
+            return self.field.identity() if other == 0 else self
+        # Nonzero elements satisfy a^(q-1) = 1
+        order = self.field._size - 1
+        other %= order
+        tables = self.field.log_tables()
+        if tables is not None:
+            log, exp = tables
+            return _element(self.field, exp[log[self.value]*other % order])
+
+        return _element(self.field, self.field.power(self.value, other))
 
     def __neg__(self):
-        return FieldElement(self.characteristic, self.degree,
-                            [-i for i in self.vector])
+        prime = self.characteristic
+        if prime == 2:
+            return self
+        return _element(self.field, digits_to_int(
+            [-i % prime for i in self.digits()], prime))
 
     def __eq__(self, other):
-        if other == 0:
-            return all(i == 0 for i in self.vector)
+        if isinstance(other, int) and other in (0, 1):
+            return self.value == other
         if not isinstance(other, FieldElement):
             return False
-        return (self - other).reduce_element() == 0
+        return self.field is other.field and self.value == other.value
     
     def len(self):
         """Returns the length of the vector representation
         """
-        return len(self.vector)
+        return self.degree
     
-    def reduce_element(self, reduce_status = ALWAYS_REDUCE):
-        """Reduces the element to a representaion of length less than the
-        degree of the field if the variable ALWAYS_REDUCE is True
+    def reduce_element(self, reduce_status = True):
+        """Returns the element itself. Packed elements are always stored
+        reduced, so there is nothing left to do here and reduce_status is
+        ignored. It is kept so existing calls keep working.
         """
-        if not reduce_status:
-            return self
-        
-        vector_repr = self.vector
-        deg = self.degree
-        irred_poly = super().irred_poly()
+        return self
 
-        algebraic_element = [-i for i in irred_poly]
-        del algebraic_element[-1]
 
-        while len(vector_repr) > deg:
-            for i in range(deg):
-                vector_repr[len(vector_repr)-1-deg+i] += \
-                            vector_repr[-1]*algebraic_element[i]
-            del vector_repr[-1]
-        return FieldElement(self.characteristic, deg, vector_repr)
+def _modulus_coeffs(modulus, prime: int, degree: int) -> list:
+    """Returns the monic integer coefficient list of a modulus given as a
+    Polynomial, a list of coefficients or a registered name
+    """
+    if isinstance(modulus, str):
+        named_prime, named_degree, coeffs = named_modulus(modulus)
+        if (named_prime, named_degree) != (prime, degree):
+            raise ValueError(f"Modulus {modulus} defines "
+                             f"F({named_prime}^{named_degree})")
+    else:
+        if isinstance(modulus, Polynomial):
+            modulus = modulus.coeffs
+        coeffs = poly_trim([i % prime if isinstance(i, int) else i.value
+                            for i in modulus])
+    if len(coeffs) != degree + 1:
+        raise ValueError(f"Modulus must have degree {degree}")
+    return poly_scale(coeffs, pow(coeffs[-1], -1, prime), prime)
 
+def _element(field: FiniteField, value: int) -> FieldElement:
+    """Creates a field element directly from an already reduced packed
+    value, skipping the checks done in FieldElement.__init__
+    """
+    element = FieldElement.__new__(FieldElement)
+    element.field = field
+    element.value = value
+    return element
 
 def _compare_class(field_element_1: FieldElement,
                    field_element_2: FieldElement):
     if not (isinstance(field_element_1, FieldElement) and
             isinstance(field_element_2, FieldElement)):
         raise TypeError("Both must be of FieldElement type")
-    if field_element_1.characteristic != field_element_2.characteristic \
-        or field_element_1.degree != field_element_2.degree:
+    if field_element_1.field is not field_element_2.field:
         raise ValueError("Elements are from different fields")
-    
-def _transition_matrix(i: int, field: FiniteField):
-    tmp_matrix = []
-    for row in identity_matrix(field.degree+i, field.characteristic):
-        tmp_matrix.append(row)
-    last_row = [0]*i + [-j for j in field.irred_poly().coeffs[:-1]]
-    tmp_matrix.append(last_row)
-    return Matrix(tmp_matrix)
-
-def _element_to_matrix(field_element: FieldElement):
-    field_element.reduce_element(True)
-    coeffs = field_element.vector
-    tmp_matrix = []
-    for i in range(field_element.degree):
-        tmp_matrix.append([0]*i + coeffs + [0]*(field_element.degree-1-i))
-    return Matrix(tmp_matrix)
\ No newline at end of file
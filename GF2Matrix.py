@@ -0,0 +1,293 @@
+from IntegersModP import IntegersMod, IntegersModElement
+from Matrix import Matrix
+
+# Number of columns or rows handled by one Four Russians table
+M4RI_BITS = 8
+
+
+class GF2Matrix:
+    """Matrices over F_2 with every row packed into a Python integer
+
+    Bit j of row i is the entry in column j, so adding rows is XOR.
+    Products use the Method of Four Russians (M4RM) and elimination its
+    M4RI variant: M4RI_BITS rows or pivot rows at a time are combined into
+    a table of all their sums, and every other row is updated with one
+    table lookup.
+    """
+
+    def __init__(self, coeffs, columns=None):
+        """
+        Creates a matrix from a Matrix, a list of rows of 0/1 integers or
+        IntegersModElement, or a list of packed integer rows together with
+        the number of columns
+        """
+        if isinstance(coeffs, Matrix):
+            coeffs = coeffs.coeffs
+        if columns is None:
+            if not all(len(row) == len(coeffs[0]) for row in coeffs):
+                raise IndexError("Matrix dimension not valid")
+            columns = len(coeffs[0])
+            coeffs = [_pack_row(row) for row in coeffs]
+        self.data = list(coeffs)
+        self.rows = len(self.data)
+        self.columns = columns
+
+    @classmethod
+    def identity(cls, n: int):
+        """Returns the n by n identity matrix
+        """
+        return cls([1 << i for i in range(n)], n)
+
+    @classmethod
+    def zero(cls, n: int, m: int):
+        """Returns the n by m zero matrix
+        """
+        return cls([0]*n, m)
+
+    def to_matrix(self) -> Matrix:
+        """Returns the matrix as a Matrix of IntegersModElement
+        """
+        F = IntegersMod(2)
+        return Matrix([[F(i) for i in row] for row in self])
+
+    def __str__(self):
+        return "\n".join("[" + " ".join(str(i) for i in row) + "]"
+                         for row in self)
+
+    def __repr__(self):
+        return f'GF2Mat({self.rows}x{self.columns})'
+
+    def __iter__(self):
+        return (self[i] for i in range(self.rows))
+
+    def __getitem__(self, i):
+        """Returns row i as a list of 0/1 integers
+        """
+        return _unpack_row(self.data[i], self.columns)
+
+    def __add__(self, other):
+        if isinstance(other, int) and other == 0:
+            return self
+        other = _coerce(other)
+        _compare_matrices(self, other)
+        return GF2Matrix([a ^ b for a, b in zip(self.data, other.data)],
+                         self.columns)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    __sub__ = __add__
+
+    def __neg__(self):
+        return self
+
+    def __mul__(self, other):
+        """Matrix product by the Method of Four Russians
+        """
+        if isinstance(other, int) and other == 1:
+            return self
+        other = _coerce(other)
+        if self.columns != other.rows:
+            raise IndexError("Matrices are incompatible")
+        product = [0]*self.rows
+        mask = (1 << M4RI_BITS) - 1
+        for start in range(0, other.rows, M4RI_BITS):
+            table = _combinations(other.data[start:start + M4RI_BITS])
+            for i, row in enumerate(self.data):
+                index = row >> start & mask
+                if index:
+                    product[i] ^= table[index]
+        return GF2Matrix(product, other.columns)
+
+    def __rmul__(self, other):
+        if isinstance(other, int) and other == 1:
+            return self
+        return _coerce(other) * self
+
+    def __eq__(self, other):
+        if isinstance(other, int) and other == 0:
+            return not any(self.data)
+        if isinstance(other, Matrix):
+            other = GF2Matrix(other)
+        if not isinstance(other, GF2Matrix):
+            return False
+        return self.columns == other.columns and self.data == other.data
+
+    def transpose(self):
+        """Returns the transpose of the matrix.
+
+        Matrix remains Unaffected.
+        """
+        if not self.data:
+            return GF2Matrix([], 0)
+        strings = [format(row, f"0{self.columns}b")[::-1]
+                   for row in self.data]
+        return GF2Matrix([int("".join(column)[::-1], 2)
+                          for column in zip(*strings)], self.rows)
+
+    def copy(self):
+        """Makes a copy of the matrix
+        """
+        return GF2Matrix(self.data, self.columns)
+
+    def rref(self):
+        """Returns the reduced row echelon form of the matrix and the list
+        of its pivot columns
+        """
+        rows = self.data[:]
+        pivots = _m4ri_rref(rows, self.columns)
+        return GF2Matrix(rows, self.columns), pivots
+
+    def rank(self):
+        """Returns the rank of the matrix
+        """
+        return len(_m4ri_rref(self.data[:], self.columns))
+
+    def det(self):
+        """Returns the determinant, 1 for invertible matrices and 0
+        otherwise. Needs to be square matrix.
+        """
+        if self.rows != self.columns:
+            raise ValueError("Must be square matrix")
+        return int(self.rank() == self.rows)
+
+    def solve(self, b):
+        """Solves Ax = b, with the free variables set to zero
+
+        b is a list of 0/1 integers or IntegersModElement, or a packed
+        integer, and x is returned as a list of 0/1 integers. Raises
+        ValueError if the system has no solution.
+        """
+        if not isinstance(b, int):
+            if len(b) != self.rows:
+                raise ValueError(f"Vector needs to be of size {self.rows}")
+            b = _pack_row(b)
+        n = self.columns
+        rows = [row | (b >> i & 1) << n for i, row in enumerate(self.data)]
+        pivots = _m4ri_rref(rows, n)
+        if any(row >> n for row in rows[len(pivots):]):
+            raise ValueError("System has no solution")
+        x = 0
+        for row, c in zip(rows, pivots):
+            x |= (row >> n & 1) << c
+        return _unpack_row(x, n)
+
+    def nullspace(self):
+        """Returns a matrix whose rows form a basis of the solutions of
+        Ax = 0
+        """
+        rows = self.data[:]
+        pivots = _m4ri_rref(rows, self.columns)
+        pivot_set = set(pivots)
+        basis = []
+        for free in range(self.columns):
+            if free in pivot_set:
+                continue
+            x = 1 << free
+            for row, c in zip(rows, pivots):
+                if row >> free & 1:
+                    x |= 1 << c
+            basis.append(x)
+        return GF2Matrix(basis, self.columns)
+
+    def inverse(self):
+        """Returns the inverse of the matrix, by eliminating it next to the
+        identity matrix
+        """
+        n = self.rows
+        if n != self.columns:
+            raise ValueError("Must be square matrix")
+        rows = [row | 1 << (n + i) for i, row in enumerate(self.data)]
+        if len(_m4ri_rref(rows, n)) < n:
+            raise ValueError("Matrix is singular")
+        return GF2Matrix([row >> n for row in rows], n)
+
+
+def _m4ri_rref(rows: list, columns: int) -> list:
+    """Brings the packed rows to reduced row echelon form in place, with
+    pivots among the first 'columns' bits, and returns the pivot columns
+
+    The columns are handled in strips of M4RI_BITS. The pivots of a strip
+    are found on the rows below the previous pivots and reduced against
+    each other, then a table of all sums of the pivot rows, indexed by the
+    strip bits, clears the strip in every other row with one lookup.
+    """
+    m = len(rows)
+    mask = (1 << M4RI_BITS) - 1
+    pivots = []
+    r = 0
+    for start in range(0, columns, M4RI_BITS):
+        if r == m:
+            break
+        strip_pivots = []
+        first = r
+        for c in range(start, min(start + M4RI_BITS, columns)):
+            for i in range(r, m):
+                row = rows[i]
+                for pc, pivot_row in strip_pivots:
+                    if row >> pc & 1:
+                        row ^= pivot_row
+                if row >> c & 1:
+                    break
+            else:
+                continue
+            rows[i] = rows[r]
+            rows[r] = row
+            for k, (pc, pivot_row) in enumerate(strip_pivots):
+                if pivot_row >> c & 1:
+                    strip_pivots[k] = (pc, pivot_row ^ row)
+            strip_pivots.append((c, row))
+            r += 1
+            if r == m:
+                break
+        if not strip_pivots:
+            continue
+
+        for k, (c, row) in enumerate(strip_pivots):
+            rows[first + k] = row
+        table = [0]*(1 << M4RI_BITS)
+        by_bit = {c - start: row for c, row in strip_pivots}
+        for index in range(1, 1 << M4RI_BITS):
+            low = index & -index
+            table[index] = table[index ^ low] ^ \
+                by_bit.get(low.bit_length() - 1, 0)
+        for i in range(m):
+            if first <= i < r:
+                continue
+            index = rows[i] >> start & mask
+            if index:
+                rows[i] ^= table[index]
+        pivots += [c for c, _ in strip_pivots]
+    return pivots
+
+def _combinations(rows: list) -> list:
+    """Returns the table of all sums of the given rows, indexed by the
+    bits selecting them
+    """
+    table = [0]*(1 << len(rows))
+    for index in range(1, len(table)):
+        low = index & -index
+        table[index] = table[index ^ low] ^ rows[low.bit_length() - 1]
+    return table
+
+def _pack_row(row: list) -> int:
+    bits = "".join("1" if (i.value if isinstance(i, IntegersModElement)
+                           else i) & 1 else "0" for i in reversed(row))
+    return int(bits or "0", 2)
+
+def _unpack_row(value: int, columns: int) -> list:
+    return [int(bit) for bit in format(value, f"0{columns}b")[::-1]] \
+        if columns else []
+
+def _coerce(other):
+    if isinstance(other, GF2Matrix):
+        return other
+    if isinstance(other, Matrix):
+        return GF2Matrix(other)
+    raise TypeError("Other not Matrix type")
+
+def _compare_matrices(A: GF2Matrix, B: GF2Matrix):
+    """Checks if matrices A and B are of the same size
+    """
+    if A.rows != B.rows or A.columns != B.columns:
+        raise ValueError("Both matrcies must be of same size")
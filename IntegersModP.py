@@ -2,50 +2,71 @@ from finitefield_functions import isPrime
 
 class IntegersMod:
     """Implementation of the field of integers modulo p, for some prime p
+
+    Fields are interned, so the primality of p is only checked the first
+    time IntegersMod(p) is created.
     """
-    
-    def __init__(self, prime):
-        if not isPrime(prime):
-            raise ValueError(f"Base number {prime} must be prime")
-        self.characteristic = prime
-    
+
+    _fields = {}
+
+    def __new__(cls, prime):
+        field = cls._fields.get(prime)
+        if field is None:
+            if not isPrime(prime):
+                raise ValueError(f"Base number {prime} must be prime")
+            field = super().__new__(cls)
+            field.characteristic = prime
+            cls._fields[prime] = field
+        return field
+
+    def __reduce__(self):
+        return (IntegersMod, (self.characteristic,))
+
     def __call__(self,value):
-        return IntegersModElement(value, self.characteristic)
-    
+        return _element(value % self.characteristic, self.characteristic)
+
     def __iter__(self):
         return iter(self.elements())
 
     def elements(self):
         """Returns a list of all field elements
         """
-        return [IntegersModElement(i, self.characteristic) for i in
+        return [_element(i, self.characteristic) for i in
                                     range(self.characteristic)]
-    
+
     def identity(self):
         """Returns the identity element of the field
         """
         return self(1)
-    
+
     def zero(self):
         """Retruns the zero element of the field
         """
         return self(0)
 
-class IntegersModElement(IntegersMod):
+class IntegersModElement:
     """Field elements of the field of integers modulo p
+
+    The prime is not checked here; use IntegersMod(p)(value) to create
+    elements of a validated field.
     """
-    
+
+    __slots__ = ("value", "characteristic")
+
     def __init__(self, value, prime):
-        super().__init__(prime)
         self.value = value % prime
         self.characteristic = prime
 
+    @property
+    def field(self):
+        return IntegersMod(self.characteristic)
+
     def __str__(self):
         return f'{self.value} (mod {self.characteristic})'
-    
+
     def __repr__(self):
         return str(self)
-    
+
     def __format__(self, format_spec):
         if isinstance(format_spec, int):
             l = len(str(self.value))
@@ -53,66 +74,86 @@ class IntegersModElement(IntegersMod):
             return " "*(format_spec-l) + str(self)
         return str(self)
 
+    def __hash__(self):
+        return hash(self.value)
+
     def __add__(self, other):
-        if other == 0:
+        if type(other) is int and other == 0:
             return self
         _compare_class(self, other)
-        return IntegersModElement((self.value+other.value) 
-                                  % self.characteristic, self.characteristic)
-    
+        return _element((self.value+other.value) % self.characteristic,
+                        self.characteristic)
+
     def __radd__(self, other):
         return self.__add__(other)
-    
+
     def __sub__(self, other):
-        if other == 0:
+        if type(other) is int and other == 0:
             return self
         _compare_class(self, other)
-        return IntegersModElement((self.value-other.value)
-                                  % self.characteristic, self.characteristic)
-    
+        return _element((self.value-other.value) % self.characteristic,
+                        self.characteristic)
+
+    def __rsub__(self, other):
+        return (-self).__add__(other)
+
     def __neg__(self):
-        return IntegersModElement(-self.value % self.characteristic,
-                                  self.characteristic)
-    
+        return _element(-self.value % self.characteristic,
+                        self.characteristic)
+
     def __mul__(self, other):
-        if other == 0:
-            return super().zero()
-        if other == 1:
-            return self
+        if type(other) is int:
+            if other == 0:
+                return _element(0, self.characteristic)
+            if other == 1:
+                return self
         _compare_class(self, other)
-        return IntegersModElement((self.value*other.value)
-                                  % self.characteristic, self.characteristic)
-    
+        return _element((self.value*other.value) % self.characteristic,
+                        self.characteristic)
+
     def __rmul__(self, other):
         return self.__mul__(other)
 
     def __pow__(self, other):
         if not isinstance(other, int):
             raise TypeError("Other needs to be int")
-        return IntegersModElement(pow(self.value, other, self.characteristic),
-                                  self.characteristic)
+        if other < 0:
+            return self.inverse() ** -other
+        return _element(pow(self.value, other, self.characteristic),
+                        self.characteristic)
 
     def inverse(self):
         """Computes the inverse of the field element
-
-        This is done by computing a^(p-2)
         """
-        if self == 0:
+        if self.value == 0:
             raise ZeroDivisionError("Zero has no inverse")
-        return self ** (self.characteristic-2)
-    
+        return _element(pow(self.value, -1, self.characteristic),
+                        self.characteristic)
+
     def __truediv__(self, other):
         _compare_class(self, other)
-        return self * other.inverse()
+        if other.value == 0:
+            raise ZeroDivisionError("Zero has no inverse")
+        return _element(self.value * pow(other.value, -1, self.characteristic)
+                        % self.characteristic, self.characteristic)
 
     def __eq__(self, other):
-        if other == 0:
-            return self.value == 0
-        if other == 1:
-            return self.value == 1
-        if not isinstance(other, IntegersModElement):
-            return False
-        return self - other == 0
+        if type(other) is IntegersModElement:
+            return self.value == other.value and \
+                   self.characteristic == other.characteristic
+        if isinstance(other, int):
+            # Equal only to the integer equal to the reduced value, which
+            # keeps the hash consistent with equality
+            return self.value == other
+        return False
+
+def _element(value: int, prime: int) -> IntegersModElement:
+    """Creates an element from a value already reduced modulo prime
+    """
+    element = IntegersModElement.__new__(IntegersModElement)
+    element.value = value
+    element.characteristic = prime
+    return element
 
 def _compare_class(element1: IntegersModElement,
                    element2: IntegersModElement):
@@ -120,4 +161,4 @@ def _compare_class(element1: IntegersModElement,
             isinstance(element2, IntegersModElement)):
         raise TypeError(f"Both must be IntegersModElement type")
     if element1.characteristic != element2.characteristic:
-        raise ValueError("Primes must be equal")
\ No newline at end of file
+        raise ValueError("Primes must be equal")
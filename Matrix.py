@@ -1,6 +1,10 @@
+from fractions import Fraction
+from heapq import heapify, heappop, heappush
+from operator import add, mul, sub
 from random import randint
 
-from IntegersModP import IntegersMod
+from IntegersModP import IntegersMod, IntegersModElement
+from finitefield_functions import STRASSEN_THRESHOLD
 
 class Matrix:
     """Matrix objects. Compatible with all classes that have defined
@@ -61,20 +65,33 @@ class Matrix:
         return Matrix(tmp_matrix)
 
     def __mul__(self, other):
+        """Matrix product
+
+        Over the integers modulo p the rows of the right operand are packed
+        into big integers, so a row of the product is a sum of scalar times
+        big integer products. Otherwise the right operand is transposed
+        once, and from STRASSEN_THRESHOLD rows and columns the product is
+        split recursively by the Strassen-Winograd scheme with seven
+        block multiplications instead of eight.
+        """
         if other == 1:
             return self
+        if isinstance(other, SparseMatrix):
+            return other.__rmul__(self)
         if not isinstance(other, Matrix):
             raise TypeError("Other not Matrix type")
         if self.columns != other.rows:
             raise IndexError("Matrices are incompatible")
-        tmp_matrix = []
-        for i in range(self.rows):
-            row = []
-            for j in range(other.columns):
-                row.append(sum([self[i][k]*other[k][j] for k in
-                                range(self.columns)]))
-            tmp_matrix.append(row)
-        return Matrix(tmp_matrix)
+        prime = _common_prime(self.coeffs + other.coeffs)
+        if prime:
+            F = IntegersMod(prime)
+            product = _mat_mul_mod_p(_residues(self.coeffs, prime),
+                                     _residues(other.coeffs, prime), prime)
+            return Matrix([[F(i) for i in row] for row in product])
+        if min(self.rows, self.columns, other.columns) >= STRASSEN_THRESHOLD:
+            zero = self.coeffs[0][0]*0
+            return Matrix(_strassen_mul(self.coeffs, other.coeffs, zero))
+        return Matrix(_mat_mul(self.coeffs, other.coeffs))
     
     def __rmul__(self, other):
         return self.__mul__(other)
@@ -103,27 +120,38 @@ class Matrix:
         return Matrix(self.coeffs)
 
     def det(self):
-        """Computes the determinant of the matrix.
-        
-        Needs to be square matrix.
+        """Computes the determinant of the matrix by Gaussian elimination.
+
+        Needs to be square matrix. Integer matrices use the fraction free
+        Bareiss algorithm, other matrices their LU factorization. Both take
+        O(n^3) operations.
         """
         if self.rows != self.columns:
             raise ValueError("Must be square matrix")
-        if self.rows == 1:
-            return self.coeffs[0][0]
+        if all(isinstance(i, int) for row in self.coeffs for i in row):
+            return _bareiss_det([list(row) for row in self.coeffs])
+        return self.lu().det()
 
-        column1 = [row[0] for row in self.coeffs]
-        tmp_matrix = self.remove_column(0)
-        sum = 0
+    def lu(self):
+        """Returns the PLU factorization of the matrix, see LUDecomposition
+        """
+        return LUDecomposition(self)
 
-        for i in range(len(column1)):
-            reduced_matrix = tmp_matrix.remove_row(i)
-            if i%2 == 0:
-                sum += column1[i] * reduced_matrix.det()
-            else:
-                sum -= column1[i] * reduced_matrix.det()
-        
-        return sum
+    def rank(self):
+        """Returns the rank of the matrix
+        """
+        return self.lu().rank
+
+    def inverse(self):
+        """Returns the inverse of the matrix. Needs to be square and
+        nonsingular.
+        """
+        return self.lu().inverse()
+
+    def nullspace(self):
+        """Returns a basis of the vectors x with Ax = 0, as a list of lists
+        """
+        return self.lu().nullspace()
 
     def remove_row(self, i=None):
         """Returns a matrix with row i removed
@@ -166,25 +194,502 @@ class Matrix:
 
     def solve(self, b: list):
         """Solves Ax = b by Gaussian elimination
+
+        To solve for many right hand sides, factor the matrix once with
+        lu() and use its solve and solve_many methods.
         """
-        A = self.transpose()
-        coeffs = A.coeffs
-        A = Matrix(coeffs + [b]).transpose()
+        return self.lu().solve(b)
 
-        row_reduction(A)
-        
-        for i in range(A.rows // 2):
-            A.row_swap(i, A.rows-1 - i)
-        A = A.transpose()
 
-        for i in range((A.rows-1) // 2):
-            A.row_swap(i, A.rows-2 - i)
-        A = A.transpose()
-        
-        row_reduction(A)
+class LUDecomposition:
+    """The factorization PA = LU of an m by n matrix A over its coefficient
+    field, computed by one elimination pass with row pivoting
+
+    P is a row permutation, L is unit lower triangular and U is in row
+    echelon form, so rank deficient and rectangular matrices are allowed.
+    L and U share one table: the multipliers of L are stored below the
+    pivots of U. Matrices over the integers modulo p are factored on
+    integer residues, integer matrices over the rationals (with Fraction)
+    and other coefficients with their own field arithmetic.
+
+    The factorization is reused by solve, solve_many, nullspace, inverse
+    and det, so each right hand side costs O(mn) operations.
+    """
+
+    def __init__(self, matrix: Matrix):
+        rows = [list(row) for row in matrix.coeffs]
+        self.rows = matrix.rows
+        self.columns = matrix.columns
+        self.prime = _common_prime(rows)
+        self._integer = self.prime is None and \
+            all(isinstance(i, int) for row in rows for i in row)
+        self.lu = [self._convert(row) for row in rows]
+        self.perm = list(range(self.rows))
+        self.pivots = []
+        self.swaps = 0
+        self._one = None
+        self._factor()
+
+    def _convert(self, vector: list) -> list:
+        if self.prime:
+            prime = self.prime
+            return [i.value if isinstance(i, IntegersModElement)
+                    else i % prime for i in vector]
+        if self._integer:
+            return [Fraction(i) for i in vector]
+        return list(vector)
+
+    def _output(self, vector: list) -> list:
+        if self.prime:
+            F = IntegersMod(self.prime)
+            return [F(i) for i in vector]
+        return vector
+
+    def _factor(self):
+        lu = self.lu
+        prime = self.prime
+        m = self.rows
+        r = 0
+        for c in range(self.columns):
+            if r == m:
+                break
+            pivot = next((k for k in range(r, m) if lu[k][c] != 0), None)
+            if pivot is None:
+                continue
+            if pivot != r:
+                lu[r], lu[pivot] = lu[pivot], lu[r]
+                self.perm[r], self.perm[pivot] = self.perm[pivot], self.perm[r]
+                self.swaps += 1
+            pivot_row = lu[r]
+            if prime:
+                inverse = pow(pivot_row[c], -1, prime)
+            else:
+                if self._one is None:
+                    self._one = pivot_row[c]/pivot_row[c]
+                inverse = self._one/pivot_row[c]
+            tail = pivot_row[c+1:]
+            for k in range(r + 1, m):
+                row = lu[k]
+                if row[c] == 0:
+                    continue
+                if prime:
+                    factor = row[c]*inverse % prime
+                    row[c+1:] = [(a - factor*b) % prime
+                                 for a, b in zip(row[c+1:], tail)]
+                else:
+                    factor = row[c]*inverse
+                    row[c+1:] = [a - factor*b
+                                 for a, b in zip(row[c+1:], tail)]
+                row[c] = factor
+            self.pivots.append(c)
+            r += 1
+
+    @property
+    def rank(self):
+        return len(self.pivots)
+
+    def _zero(self):
+        if self.prime or self._integer:
+            return 0
+        return self.lu[0][0]*0
+
+    def _unit(self):
+        if self.prime:
+            return 1
+        if self._one is None:
+            return self.lu[0][0]**0
+        return self._one
+
+    def P(self) -> Matrix:
+        """Returns the permutation matrix P
+        """
+        zero = self._zero()
+        one = self._unit()
+        return Matrix([self._output([one if j == self.perm[i] else zero
+                                     for j in range(self.rows)])
+                       for i in range(self.rows)])
+
+    def L(self) -> Matrix:
+        """Returns the m by m unit lower triangular matrix L
+        """
+        zero = self._zero()
+        one = self._unit()
+        rows = []
+        for i in range(self.rows):
+            row = [zero]*self.rows
+            for t, c in enumerate(self.pivots[:i]):
+                row[t] = self.lu[i][c]
+            row[i] = one
+            rows.append(self._output(row))
+        return Matrix(rows)
+
+    def U(self) -> Matrix:
+        """Returns the m by n row echelon matrix U
+        """
+        zero = self._zero()
+        rows = []
+        for i, row in enumerate(self.lu):
+            start = self.pivots[i] if i < self.rank else self.columns
+            rows.append(self._output([zero]*start + row[start:]))
+        return Matrix(rows)
+
+    def solve(self, b: list) -> list:
+        """Returns a solution x of Ax = b, with the free variables set to
+        zero. Raises ValueError if the system has no solution.
+        """
+        if len(b) != self.rows:
+            raise ValueError(f"Vector needs to be of size {self.rows}")
+        return self._output(self._solve(self._convert(b)))
+
+    def solve_many(self, B) -> list:
+        """Returns the solutions of Ax = b for every vector b in B, or the
+        matrix X with AX = B if B is a Matrix
+        """
+        if isinstance(B, Matrix):
+            columns = B.transpose().coeffs
+            return Matrix([list(row) for row in
+                           zip(*[self.solve(b) for b in columns])])
+        return [self.solve(b) for b in B]
+
+    def _solve(self, b: list) -> list:
+        lu = self.lu
+        prime = self.prime
+        pivots = self.pivots
+        rank = self.rank
+        zero = self._zero()
+
+        y = [b[i] for i in self.perm]
+        for i in range(1, self.rows):
+            total = y[i]
+            for t in range(min(i, rank)):
+                total = total - lu[i][pivots[t]]*y[t]
+            y[i] = total % prime if prime else total
+        if any(y[i] != 0 for i in range(rank, self.rows)):
+            raise ValueError("System has no solution")
+        return self._back_substitute(y, [zero]*self.columns)
+
+    def _back_substitute(self, y: list, x: list) -> list:
+        """Solves Ux = y for the pivot variables, keeping the values of the
+        free variables already in x
+        """
+        lu = self.lu
+        prime = self.prime
+        for t in range(self.rank - 1, -1, -1):
+            c = self.pivots[t]
+            row = lu[t]
+            total = y[t]
+            for j in range(c + 1, self.columns):
+                if x[j] != 0:
+                    total = total - row[j]*x[j]
+            if prime:
+                x[c] = total*pow(row[c], -1, prime) % prime
+            else:
+                x[c] = total/row[c]
+        return x
+
+    def nullspace(self) -> list:
+        """Returns a basis of the solutions of Ax = 0, one vector for every
+        non-pivot column
+        """
+        zero = self._zero()
+        one = self._unit()
+        pivots = set(self.pivots)
+        basis = []
+        for free in range(self.columns):
+            if free in pivots:
+                continue
+            x = [zero]*self.columns
+            x[free] = one
+            basis.append(self._output(
+                self._back_substitute([zero]*self.rank, x)))
+        return basis
+
+    def inverse(self) -> Matrix:
+        """Returns the inverse of the matrix, solving for the columns of the
+        identity matrix
+        """
+        n = self.rows
+        if n != self.columns or self.rank < n:
+            raise ValueError("Matrix is singular")
+        zero = self._zero()
+        one = self._unit()
+        columns = []
+        for i in range(n):
+            e = [zero]*n
+            e[i] = one
+            columns.append(self._output(self._solve(e)))
+        return Matrix([list(row) for row in zip(*columns)])
+
+    def det(self):
+        """Returns the determinant, the signed product of the pivots of U
+        """
+        n = self.rows
+        if n != self.columns:
+            raise ValueError("Must be square matrix")
+        if self.rank < n:
+            return self._output([self._zero()])[0]
+        det = self.lu[0][0]
+        for i in range(1, n):
+            det = det*self.lu[i][i]
+            if self.prime:
+                det %= self.prime
+        if self.swaps % 2:
+            det = -det % self.prime if self.prime else -det
+        return self._output([det])[0]
+
+
+class SparseMatrix:
+    """Sparse matrices stored as one dictionary {column: entry} of the
+    non-zero entries of every row, so memory and the cost of products and
+    solving scale with the number of non-zero entries
+
+    Compatible with the same coefficients as Matrix. Over the integers
+    modulo p arithmetic is done on integer residues and the results are
+    IntegersModElement.
+    """
+
+    def __init__(self, coeffs, columns=None):
+        """
+        Creates a matrix from a Matrix, a list of dense rows, or a list of
+        rows {column: entry} together with the number of columns
+        """
+        if isinstance(coeffs, Matrix):
+            coeffs = coeffs.coeffs
+        if columns is None:
+            if not all(len(row) == len(coeffs[0]) for row in coeffs):
+                raise IndexError("Matrix dimension not valid")
+            columns = len(coeffs[0])
+            coeffs = [{j: a for j, a in enumerate(row) if a != 0}
+                      for row in coeffs]
+        self.data = [dict(row) for row in coeffs]
+        self.rows = len(self.data)
+        self.columns = columns
+
+    @property
+    def nnz(self) -> int:
+        """Returns the number of stored non-zero entries
+        """
+        return sum(len(row) for row in self.data)
+
+    def to_matrix(self) -> Matrix:
+        """Returns the matrix as a dense Matrix
+        """
+        zero = next((a*0 for row in self.data for a in row.values()), 0)
+        tmp_matrix = []
+        for row in self.data:
+            dense = [zero]*self.columns
+            for j, a in row.items():
+                dense[j] = a
+            tmp_matrix.append(dense)
+        return Matrix(tmp_matrix)
+
+    def __str__(self):
+        return str(self.to_matrix())
+
+    def __repr__(self):
+        return f'SparseMat({self.rows}x{self.columns}, nnz={self.nnz})'
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __getitem__(self, i):
+        """Returns row i as a dictionary {column: entry}
+        """
+        return self.data[i]
+
+    def __add__(self, other):
+        if isinstance(other, int) and other == 0:
+            return self
+        other = _to_sparse(other)
+        _compare_matrices(self, other)
+        tmp_matrix = []
+        for row, other_row in zip(self.data, other.data):
+            total = dict(row)
+            for j, a in other_row.items():
+                total[j] = total[j] + a if j in total else a
+            tmp_matrix.append({j: a for j, a in total.items() if a != 0})
+        return SparseMatrix(tmp_matrix, self.columns)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        if isinstance(other, int) and other == 0:
+            return self
+        return self + (-_to_sparse(other))
+
+    def __neg__(self):
+        return SparseMatrix([{j: -a for j, a in row.items()}
+                             for row in self.data], self.columns)
+
+    def __mul__(self, other):
+        """Product with a SparseMatrix, a Matrix or a vector given as a list
+
+        A sparse right operand gives a SparseMatrix, accumulating every
+        row of the product from the rows of 'other' selected by the
+        non-zero entries. A dense operand gives a Matrix, and a vector a
+        list.
+        """
+        if isinstance(other, int) and other == 1:
+            return self
+        if isinstance(other, list):
+            if len(other) != self.columns:
+                raise ValueError(f"Vector needs to be of size {self.columns}")
+            return [row[0] for row in
+                    (self*Matrix([[i] for i in other])).coeffs]
+        if not isinstance(other, (Matrix, SparseMatrix)):
+            raise TypeError("Other not Matrix type")
+        if self.columns != other.rows:
+            raise IndexError("Matrices are incompatible")
+        if isinstance(other, Matrix):
+            prime = _common_prime([list(row.values()) for row in self.data]
+                                  + other.coeffs)
+            if prime:
+                F = IntegersMod(prime)
+                product = _mat_mul_mod_p(_sparse_residues(self.data, prime),
+                                         _residues(other.coeffs, prime),
+                                         prime)
+                return Matrix([[F(i) for i in row] for row in product])
+            zero = other.coeffs[0][0]*0
+            product = []
+            for row in self.data:
+                total = [zero]*other.columns
+                for k, a in row.items():
+                    total = list(map(add, total, [a*i for i in other[k]]))
+                product.append(total)
+            return Matrix(product)
+        prime = _common_prime([list(row.values())
+                               for row in self.data + other.data])
+        if prime:
+            F = IntegersMod(prime)
+            a = _sparse_residues(self.data, prime)
+            b = _sparse_residues(other.data, prime)
+        else:
+            a, b = self.data, other.data
+        product = []
+        for row in a:
+            total = {}
+            for k, coeff in row.items():
+                for j, entry in b[k].items():
+                    total[j] = total[j] + coeff*entry if j in total \
+                               else coeff*entry
+            if prime:
+                product.append({j: F(i) for j, i in total.items()
+                                if i % prime})
+            else:
+                product.append({j: i for j, i in total.items() if i != 0})
+        return SparseMatrix(product, other.columns)
+
+    def __rmul__(self, other):
+        if isinstance(other, int) and other == 1:
+            return self
+        if not isinstance(other, Matrix):
+            raise TypeError("Other not Matrix type")
+        return (self.transpose()*other.transpose()).transpose()
+
+    def __eq__(self, other):
+        if isinstance(other, int) and other == 0:
+            return all(a == 0 for row in self.data for a in row.values())
+        if isinstance(other, Matrix):
+            other = SparseMatrix(other)
+        if not isinstance(other, SparseMatrix):
+            return False
+        if self.rows != other.rows or self.columns != other.columns:
+            return False
+        return self - other == 0
+
+    def transpose(self):
+        """Returns the transpose of the matrix.
+
+        Matrix remains Unaffected.
+        """
+        tmp_matrix = [{} for _ in range(self.columns)]
+        for i, row in enumerate(self.data):
+            for j, a in row.items():
+                tmp_matrix[j][i] = a
+        return SparseMatrix(tmp_matrix, self.rows)
+
+    def copy(self):
+        """Makes a copy of the matrix
+        """
+        return SparseMatrix(self.data, self.columns)
+
+    def solve(self, b: list) -> list:
+        """Solves Ax = b by structured Gaussian elimination, with the free
+        variables set to zero
+
+        The pivot is taken from the shortest remaining row, in its column
+        with the fewest entries (the Markowitz rule), which keeps the fill
+        in of banded, companion and low density parity check matrices
+        small. Raises ValueError if the system has no solution.
+        """
+        if len(b) != self.rows:
+            raise ValueError(f"Vector needs to be of size {self.rows}")
+        values = [a for row in self.data for a in row.values()] + list(b)
+        prime = _common_prime([values])
+        if prime:
+            x = _sparse_eliminate(_sparse_residues(self.data, prime),
+                                  [i.value if isinstance(i, IntegersModElement)
+                                   else i % prime for i in b],
+                                  self.columns, prime)
+            F = IntegersMod(prime)
+            return [F(i) for i in x]
+        if all(isinstance(i, int) for i in values):
+            return _sparse_eliminate(
+                [{j: Fraction(a) for j, a in row.items()}
+                 for row in self.data], [Fraction(i) for i in b],
+                self.columns, None)
+        return _sparse_eliminate([dict(row) for row in self.data], list(b),
+                                 self.columns, None)
+
+    def wiedemann_solve(self, b: list, tries: int = 4) -> list:
+        """Solves Ax = b for a square non-singular matrix over the integers
+        modulo p by the Wiedemann algorithm
+
+        The minimal polynomial of the sequence u A^i b, for a random u, is
+        found by Berlekamp-Massey from 2n products with A, and x is a
+        polynomial in A applied to b. This needs O(n nnz + n^2) operations
+        and no fill in. Raises ValueError if no solution is found after
+        'tries' random choices of u, which for a prime that is not tiny
+        means the matrix is singular.
+        """
+        n = self.rows
+        if n != self.columns:
+            raise ValueError("Must be square matrix")
+        if len(b) != n:
+            raise ValueError(f"Vector needs to be of size {n}")
+        prime = _common_prime([[a for row in self.data
+                                for a in row.values()] + list(b)])
+        if not prime:
+            raise ValueError("Matrix must be over the integers modulo p")
+        F = IntegersMod(prime)
+        rows = _sparse_residues(self.data, prime)
+        b = [i.value if isinstance(i, IntegersModElement) else i % prime
+             for i in b]
+        if not any(b):
+            return [F(0) for _ in range(n)]
+        for _ in range(tries):
+            u = [randint(0, prime - 1) for _ in range(n)]
+            sequence = []
+            v = b
+            for _ in range(2*n):
+                sequence.append(sum(map(mul, u, v)) % prime)
+                v = _sparse_apply(rows, v, prime)
+            connection = _berlekamp_massey(sequence, prime)
+            # The minimal polynomial is the reversed connection polynomial,
+            # and A^-1 b follows from its non-zero constant term
+            if connection[-1] == 0:
+                continue
+            x = b
+            for coeff in connection[1:-1]:
+                x = [(i + coeff*j) % prime
+                     for i, j in zip(_sparse_apply(rows, x, prime), b)]
+            scale = -pow(connection[-1], -1, prime)
+            x = [i*scale % prime for i in x]
+            if _sparse_apply(rows, x, prime) == b:
+                return [F(i) for i in x]
+        raise ValueError("Matrix is singular")
 
-        return A.transpose()[-1][::-1]
-    
 def identity_matrix(n: int, characteristic = 0) -> Matrix:
     """Returns n by n identity matrix.
 
@@ -239,6 +744,246 @@ def row_reduction(A: Matrix):
             leading_coeff = A[j][i]
             A.row_add(j, [-leading_coeff*k for k in row_to_add])
 
+def _mat_mul(a: list, b: list) -> list:
+    """Returns the product of two lists of rows, taking the columns of b
+    from its transpose
+    """
+    columns = list(zip(*b))
+    return [[sum(map(mul, row, column)) for column in columns] for row in a]
+
+def _mat_mul_mod_p(a: list, b: list, prime: int) -> list:
+    """Returns the product modulo p of two lists of rows of residues, where
+    the rows of a can also be sparse {column: residue}
+
+    Every row of b is packed into one integer with slots wide enough to
+    hold a full dot product, so a row of the product is accumulated with
+    one scalar multiplication per row of b and unpacked at the end.
+    """
+    n = len(b[0])
+    width = ((len(b)*(prime - 1)**2).bit_length() + 7) // 8 or 1
+    packed = [int.from_bytes(b"".join(c.to_bytes(width, "little")
+                                      for c in row), "little") for row in b]
+    product = []
+    for row in a:
+        total = 0
+        terms = row.items() if isinstance(row, dict) else enumerate(row)
+        for k, coeff in terms:
+            if coeff:
+                total += coeff*packed[k]
+        data = total.to_bytes(n*width, "little")
+        product.append([int.from_bytes(data[j*width:(j+1)*width], "little")
+                        % prime for j in range(n)])
+    return product
+
+def _strassen_mul(a: list, b: list, zero) -> list:
+    """Returns the product of two lists of rows by the Strassen-Winograd
+    algorithm, down to blocks smaller than STRASSEN_THRESHOLD
+
+    Odd dimensions are padded with 'zero' and the padding is cut off the
+    result.
+    """
+    m, k, n = len(a), len(b), len(b[0])
+    if min(m, k, n) < STRASSEN_THRESHOLD:
+        return _mat_mul(a, b)
+    a = _pad(a, m + m % 2, k + k % 2, zero)
+    b = _pad(b, k + k % 2, n + n % 2, zero)
+    a11, a12, a21, a22 = _split(a)
+    b11, b12, b21, b22 = _split(b)
+
+    s1 = _block_add(a21, a22)
+    s2 = _block_sub(s1, a11)
+    s3 = _block_sub(a11, a21)
+    s4 = _block_sub(a12, s2)
+    t1 = _block_sub(b12, b11)
+    t2 = _block_sub(b22, t1)
+    t3 = _block_sub(b22, b12)
+    t4 = _block_sub(t2, b21)
+
+    p1 = _strassen_mul(a11, b11, zero)
+    p2 = _strassen_mul(a12, b21, zero)
+    p3 = _strassen_mul(s4, b22, zero)
+    p4 = _strassen_mul(a22, t4, zero)
+    p5 = _strassen_mul(s1, t1, zero)
+    p6 = _strassen_mul(s2, t2, zero)
+    p7 = _strassen_mul(s3, t3, zero)
+
+    u2 = _block_add(p1, p6)
+    u3 = _block_add(u2, p7)
+    u4 = _block_add(u2, p5)
+    c11 = _block_add(p1, p2)
+    c12 = _block_add(u4, p3)
+    c21 = _block_sub(u3, p4)
+    c22 = _block_add(u3, p5)
+    top = [r1 + r2 for r1, r2 in zip(c11, c12)]
+    bottom = [r1 + r2 for r1, r2 in zip(c21, c22)]
+    return [row[:n] for row in (top + bottom)[:m]]
+
+def _pad(a: list, rows: int, columns: int, zero) -> list:
+    if rows == len(a) and columns == len(a[0]):
+        return a
+    padded = [row + [zero]*(columns - len(row)) for row in a]
+    return padded + [[zero]*columns for _ in range(rows - len(a))]
+
+def _split(a: list):
+    h, w = len(a) // 2, len(a[0]) // 2
+    return [row[:w] for row in a[:h]], [row[w:] for row in a[:h]], \
+           [row[:w] for row in a[h:]], [row[w:] for row in a[h:]]
+
+def _block_add(a: list, b: list) -> list:
+    return [list(map(add, r1, r2)) for r1, r2 in zip(a, b)]
+
+def _block_sub(a: list, b: list) -> list:
+    return [list(map(sub, r1, r2)) for r1, r2 in zip(a, b)]
+
+def _residues(rows: list, prime: int) -> list:
+    return [[i.value if isinstance(i, IntegersModElement) else i % prime
+             for i in row] for row in rows]
+
+def _sparse_residues(rows: list, prime: int) -> list:
+    return [{j: a.value if isinstance(a, IntegersModElement) else a % prime
+             for j, a in row.items()} for row in rows]
+
+def _sparse_apply(rows: list, v: list, prime: int) -> list:
+    """Returns Av modulo p for sparse rows of residues
+    """
+    return [sum(a*v[j] for j, a in row.items()) % prime for row in rows]
+
+def _to_sparse(other):
+    if isinstance(other, SparseMatrix):
+        return other
+    if isinstance(other, Matrix):
+        return SparseMatrix(other)
+    raise TypeError("Other not Matrix type")
+
+def _berlekamp_massey(sequence: list, prime: int) -> list:
+    """Returns the coefficients c_0 = 1, c_1, ..., c_L of the shortest
+    linear recurrence sum c_i s_(k-i) = 0 modulo p of the sequence
+    """
+    c, b = [1], [1]
+    length, shift, last = 0, 1, 1
+    for n, s in enumerate(sequence):
+        d = (s + sum(map(mul, c[1:length + 1],
+                         sequence[n - 1::-1] if n else []))) % prime
+        if d == 0:
+            shift += 1
+            continue
+        factor = d*pow(last, -1, prime) % prime
+        previous = c
+        c = c + [0]*(len(b) + shift - len(c))
+        for i, coeff in enumerate(b):
+            c[i + shift] = (c[i + shift] - factor*coeff) % prime
+        if 2*length <= n:
+            length, b, last, shift = n + 1 - length, previous, d, 1
+        else:
+            shift += 1
+    return (c + [0]*(length + 1))[:length + 1]
+
+def _sparse_eliminate(rows: list, rhs: list, columns: int, prime) -> list:
+    """Returns a solution of the sparse system given by rows {column: entry}
+    and right hand side rhs, with the free variables set to zero
+
+    Entries are residues modulo p if prime is given and otherwise field
+    elements. The rows are modified in place.
+    """
+    column_rows = {}
+    for i, row in enumerate(rows):
+        for j in row:
+            column_rows.setdefault(j, set()).add(i)
+    heap = [(len(row), i) for i, row in enumerate(rows)]
+    heapify(heap)
+    active = set(range(len(rows)))
+    order = []
+    while heap:
+        length, i = heappop(heap)
+        row = rows[i]
+        if i not in active or length != len(row):
+            continue
+        active.discard(i)
+        if not row:
+            if rhs[i] != 0 and (not prime or rhs[i] % prime):
+                raise ValueError("System has no solution")
+            continue
+        c = min(row, key=lambda j: len(column_rows[j]))
+        for j in row:
+            column_rows[j].discard(i)
+        pivot = row[c]
+        inverse = pow(pivot, -1, prime) if prime else None
+        for k in list(column_rows[c]):
+            other = rows[k]
+            if prime:
+                factor = other[c]*inverse % prime
+                rhs[k] = (rhs[k] - factor*rhs[i]) % prime
+            else:
+                factor = other[c]/pivot
+                rhs[k] = rhs[k] - factor*rhs[i]
+            for j, a in row.items():
+                value = other[j] - factor*a if j in other else -factor*a
+                if prime:
+                    value %= prime
+                if value != 0:
+                    if j not in other:
+                        column_rows.setdefault(j, set()).add(k)
+                    other[j] = value
+                elif j in other:
+                    del other[j]
+                    column_rows[j].discard(k)
+            heappush(heap, (len(other), k))
+        order.append((c, i))
+
+    zero = 0 if prime else None
+    x = [zero]*columns
+    for c, i in reversed(order):
+        row = rows[i]
+        total = rhs[i]
+        for j, a in row.items():
+            if j != c and x[j] is not None:
+                total = total - a*x[j]
+        x[c] = total*pow(row[c], -1, prime) % prime if prime \
+               else total/row[c]
+    if not prime:
+        zero = next((i*0 for i in x if i is not None), 0)
+        x = [zero if i is None else i for i in x]
+    return x
+
+def _bareiss_det(rows: list) -> int:
+    """Returns the determinant of a square list of integers by the Bareiss
+    algorithm, where every division is exact, eliminating in place
+    """
+    n = len(rows)
+    sign = 1
+    previous = 1
+    for i in range(n - 1):
+        pivot = next((k for k in range(i, n) if rows[k][i]), None)
+        if pivot is None:
+            return 0
+        if pivot != i:
+            rows[i], rows[pivot] = rows[pivot], rows[i]
+            sign = -sign
+        pivot_row = rows[i]
+        for k in range(i + 1, n):
+            row = rows[k]
+            for j in range(i + 1, n):
+                row[j] = (pivot_row[i]*row[j] - row[i]*pivot_row[j]) \
+                         // previous
+        previous = pivot_row[i]
+    return sign*rows[-1][-1]
+
+def _common_prime(rows: list):
+    """Returns p if the entries are IntegersModElement of a common prime p,
+    possibly mixed with integers, and None otherwise
+    """
+    prime = None
+    for row in rows:
+        for coeff in row:
+            if isinstance(coeff, IntegersModElement):
+                if prime is None:
+                    prime = coeff.characteristic
+                elif coeff.characteristic != prime:
+                    return None
+            elif not isinstance(coeff, int):
+                return None
+    return prime
+
 def _compare_matrices(A: Matrix, B: Matrix):
     """Checks if matrices A and B are of the same size
     """
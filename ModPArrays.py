@@ -0,0 +1,362 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from IntegersModP import IntegersMod, IntegersModElement
+from Matrix import Matrix
+from Polynomial import Polynomial
+
+
+class ArrayPolynomial(Polynomial):
+    """Polynomials over the integers modulo p with coefficients stored in a
+    NumPy array. Requires NumPy.
+
+    The array is int64 when products can be accumulated without overflow
+    and an object array of Python integers for large p. Addition,
+    multiplication and division are vectorized modulo p kernels. The list
+    based coeffs attribute of Polynomial is available as a view, and
+    arithmetic with a plain Polynomial converts it automatically.
+    """
+
+    def __init__(self, coeffs, prime=None):
+        """
+        Creates a polynomial from a list of integers or IntegersModElement,
+        a NumPy array or a Polynomial, a_0 first
+        """
+        if np is None:
+            raise ImportError("ArrayPolynomial requires NumPy")
+        if isinstance(coeffs, Polynomial) and \
+                not isinstance(coeffs, ArrayPolynomial):
+            coeffs = coeffs.coeffs
+        self.characteristic = _find_prime(coeffs, prime)
+        self.array = _trim(to_array(coeffs, self.characteristic))
+        self.degree = len(self.array) - 1
+
+    @property
+    def coeffs(self):
+        return from_array(self.array, self.characteristic)
+
+    def to_polynomial(self) -> Polynomial:
+        """Returns the polynomial with list based coefficients
+        """
+        return Polynomial(self.coeffs)
+
+    def _coerce(self, other):
+        if isinstance(other, ArrayPolynomial):
+            if other.characteristic != self.characteristic:
+                raise ValueError("Primes must be equal")
+            return other.array
+        if isinstance(other, Polynomial):
+            return to_array(other.coeffs, self.characteristic)
+        raise TypeError("Both need to be polynomials")
+
+    def _new(self, array):
+        return ArrayPolynomial(array, self.characteristic)
+
+    def __add__(self, other):
+        if isinstance(other, int) and other == 0:
+            return self
+        a, b = _pad(self.array, self._coerce(other))
+        return self._new((a + b) % self.characteristic)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        if isinstance(other, int) and other == 0:
+            return self
+        a, b = _pad(self.array, self._coerce(other))
+        return self._new((a - b) % self.characteristic)
+
+    def __rsub__(self, other):
+        return (-self).__add__(other)
+
+    def __neg__(self):
+        return self._new(-self.array % self.characteristic)
+
+    def __mul__(self, other):
+        if isinstance(other, int):
+            if other == 0:
+                return self._new([0])
+            if other == 1:
+                return self
+        return self._new(array_poly_mul(self.array, self._coerce(other),
+                                        self.characteristic))
+
+    def __rmul__(self, other):
+        return self.__mul__(other)
+
+    def division(self, other):
+        """Long division modulo p, with the leading coefficient of the
+        divisor inverted once
+        """
+        divisor = self._coerce(other)
+        quotient, remainder = array_poly_divmod(self.array, divisor,
+                                                self.characteristic)
+        return self._new(quotient), self._new(remainder)
+
+    def __rtruediv__(self, other):
+        return self._new(self._coerce(other)) / self
+
+    def __rfloordiv__(self, other):
+        return self._new(self._coerce(other)) // self
+
+    def __rmod__(self, other):
+        return self._new(self._coerce(other)) % self
+
+    def __eq__(self, other):
+        if isinstance(other, int) and other == 0:
+            return not self.array.any()
+        if not isinstance(other, Polynomial):
+            return False
+        a, b = _pad(self.array, self._coerce(other))
+        return bool(((a - b) % self.characteristic == 0).all())
+
+
+class ArrayMatrix(Matrix):
+    """Matrices over the integers modulo p with coefficients stored in a
+    two dimensional NumPy array. Requires NumPy.
+
+    Addition and multiplication are vectorized modulo p kernels; the
+    row operations used by the elimination routines act on the array.
+    Rows read through indexing are lists of IntegersModElement, and
+    arithmetic with a plain Matrix converts it automatically.
+    """
+
+    def __init__(self, coeffs, prime=None):
+        """
+        Creates a matrix from a list of rows, a two dimensional NumPy array
+        or a Matrix
+        """
+        if np is None:
+            raise ImportError("ArrayMatrix requires NumPy")
+        if isinstance(coeffs, Matrix) and not isinstance(coeffs, ArrayMatrix):
+            coeffs = coeffs.coeffs
+        if isinstance(coeffs, np.ndarray):
+            flat = coeffs.ravel()
+        else:
+            if not all(len(row) == len(coeffs[0]) for row in coeffs):
+                raise IndexError("Matrix dimension not valid")
+            flat = [i for row in coeffs for i in row]
+        self.characteristic = _find_prime(flat, prime)
+        self.array = to_array(flat, self.characteristic).reshape(
+            len(coeffs), -1)
+        self.rows, self.columns = self.array.shape
+
+    @property
+    def coeffs(self):
+        return [from_array(row, self.characteristic) for row in self.array]
+
+    def __getitem__(self, i):
+        return from_array(self.array[i], self.characteristic)
+
+    def to_matrix(self) -> Matrix:
+        """Returns the matrix with list based coefficients
+        """
+        return Matrix(self.coeffs)
+
+    def _coerce(self, other):
+        if isinstance(other, ArrayMatrix):
+            if other.characteristic != self.characteristic:
+                raise ValueError("Primes must be equal")
+            return other.array
+        if isinstance(other, Matrix):
+            return to_array([i for row in other for i in row],
+                            self.characteristic).reshape(other.rows, -1)
+        raise TypeError("Other not Matrix type")
+
+    def _new(self, array):
+        return ArrayMatrix(array, self.characteristic)
+
+    def __add__(self, other):
+        if isinstance(other, int) and other == 0:
+            return self
+        other = self._coerce(other)
+        if other.shape != self.array.shape:
+            raise ValueError("Both matrcies must be of same size")
+        return self._new((self.array + other) % self.characteristic)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        if isinstance(other, int) and other == 0:
+            return self
+        other = self._coerce(other)
+        if other.shape != self.array.shape:
+            raise ValueError("Both matrcies must be of same size")
+        return self._new((self.array - other) % self.characteristic)
+
+    def __rsub__(self, other):
+        return (-self).__add__(other)
+
+    def __neg__(self):
+        return self._new(-self.array % self.characteristic)
+
+    def __mul__(self, other):
+        if isinstance(other, int) and other == 1:
+            return self
+        other = self._coerce(other)
+        if self.columns != other.shape[0]:
+            raise IndexError("Matrices are incompatible")
+        return self._new(array_mat_mul(self.array, other,
+                                       self.characteristic))
+
+    def __rmul__(self, other):
+        if isinstance(other, int) and other == 1:
+            return self
+        return self._new(self._coerce(other)) * self
+
+    def __eq__(self, other):
+        if isinstance(other, int) and other == 0:
+            return not self.array.any()
+        if not isinstance(other, Matrix):
+            return False
+        other = self._coerce(other)
+        return other.shape == self.array.shape and \
+            bool((self.array == other).all())
+
+    def transpose(self):
+        """Returns the transpose of the matrix.
+
+        Matrix remains Unaffected.
+        """
+        return self._new(self.array.T.copy())
+
+    def copy(self):
+        """Makes a copy of the matrix
+        """
+        return self._new(self.array.copy())
+
+    def remove_row(self, i=None):
+        """Returns a matrix with row i removed
+        """
+        if i is None:
+            return self.copy()
+        return self._new(np.delete(self.array, i, axis=0))
+
+    def remove_column(self, j=None):
+        """Returns a matrix with column j removed
+        """
+        if j is None:
+            return self.copy()
+        return self._new(np.delete(self.array, j, axis=1))
+
+    def row_swap(self, i, j):
+        """Swaps row i and j of the matrix
+        """
+        self.array[[i, j]] = self.array[[j, i]]
+        return self
+
+    def row_divide(self, i, scale):
+        """Divides all items on row i by 'scale'
+        """
+        p = self.characteristic
+        scale = scale.value if isinstance(scale, IntegersModElement) \
+            else scale
+        self.array[i] = self.array[i]*pow(scale, -1, p) % p
+        return self
+
+    def row_add(self, i, vector: list):
+        """Adds elements in vector to their respective place in row i
+        """
+        if len(vector) != self.columns:
+            raise ValueError(f"Vector needs to be of size {self.columns}")
+        p = self.characteristic
+        self.array[i] = (self.array[i] + to_array(vector, p)) % p
+        return self
+
+
+def array_dtype(prime: int, terms: int = 1):
+    """Returns int64 if a sum of 'terms' products of residues modulo prime
+    fits in a signed 64 bit integer, and object otherwise
+    """
+    if terms*(prime - 1)**2 < 2**63:
+        return np.int64
+    return object
+
+def to_array(coeffs, prime: int):
+    """Converts a list of integers or IntegersModElement, or an array, to a
+    NumPy array of residues modulo prime
+    """
+    if isinstance(coeffs, np.ndarray):
+        if coeffs.dtype == object and array_dtype(prime) is np.int64:
+            coeffs = coeffs.astype(np.int64)
+        return coeffs % prime
+    values = [i.value if isinstance(i, IntegersModElement) else int(i)
+              for i in coeffs]
+    return np.array(values, dtype=array_dtype(prime)) % prime
+
+def from_array(array, prime: int) -> list:
+    """Converts an array of residues to a list of IntegersModElement
+    """
+    field = IntegersMod(prime)
+    return [field(int(i)) for i in array]
+
+def array_poly_mul(a, b, prime: int):
+    """Returns the product of two coefficient arrays modulo prime
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if a.dtype != object and array_dtype(prime, len(b)) is np.int64:
+        return np.convolve(a, b) % prime
+    product = np.zeros(len(a) + len(b) - 1, dtype=object)
+    for i, coeff in enumerate(b):
+        if coeff:
+            product[i:i+len(a)] = (product[i:i+len(a)] + int(coeff)*a) % prime
+    return product
+
+def array_poly_divmod(a, b, prime: int):
+    """Returns quotient and remainder arrays of a divided by b modulo prime
+    """
+    b = _trim(b)
+    if not b.any():
+        raise ValueError("The divisor polynomial cannot be zero.")
+    deg_b = len(b) - 1
+    remainder = _trim(a).copy()
+    if len(remainder) <= deg_b:
+        return np.zeros(1, dtype=a.dtype), remainder
+    lead_inv = pow(int(b[-1]), -1, prime)
+    quotient = np.zeros(len(remainder) - deg_b, dtype=remainder.dtype)
+    for i in range(len(quotient) - 1, -1, -1):
+        coeff = int(remainder[i + deg_b])*lead_inv % prime
+        quotient[i] = coeff
+        if coeff:
+            remainder[i:i+deg_b+1] = (remainder[i:i+deg_b+1] - coeff*b) % prime
+    return quotient, remainder[:max(deg_b, 1)]
+
+def array_mat_mul(a, b, prime: int):
+    """Returns the matrix product of two arrays modulo prime
+
+    The inner dimension is split into chunks small enough for the int64
+    accumulation not to overflow.
+    """
+    if a.dtype == object or b.dtype == object or \
+            array_dtype(prime) is object:
+        return (a.astype(object) @ b.astype(object)) % prime
+    chunk = max(1, (2**63 - prime) // (prime - 1)**2)
+    product = np.zeros((a.shape[0], b.shape[1]), dtype=np.int64)
+    for k in range(0, a.shape[1], chunk):
+        product = (product + a[:, k:k+chunk] @ b[k:k+chunk]) % prime
+    return product
+
+def _find_prime(coeffs, prime):
+    if prime is not None:
+        return prime
+    for coeff in coeffs:
+        if isinstance(coeff, IntegersModElement):
+            return coeff.characteristic
+    raise ValueError("Prime must be given for integer coefficients")
+
+def _trim(array):
+    nonzero = np.flatnonzero(array)
+    length = nonzero[-1] + 1 if len(nonzero) else 1
+    return array[:length]
+
+def _pad(a, b):
+    if len(a) < len(b):
+        a = np.concatenate([a, np.zeros(len(b) - len(a), dtype=a.dtype)])
+    elif len(b) < len(a):
+        b = np.concatenate([b, np.zeros(len(a) - len(b), dtype=b.dtype)])
+    return a, b
@@ -1,5 +1,7 @@
-from IntegersModP import IntegersMod
-from finitefield_functions import largest_index
+from IntegersModP import IntegersMod, IntegersModElement
+from finitefield_functions import largest_index, KARATSUBA_THRESHOLD
+from polynomial_functions import poly_mul, schoolbook_mul, karatsuba_mul, \
+                                 poly_divmod, PrecomputedModulus
 
 
 class Polynomial:
@@ -24,7 +26,7 @@ class Polynomial:
         if all(coef == 0 for coef in self.coeffs):
             return "0"
         
-        if isinstance(self.coeffs[0], IntegersMod):
+        if isinstance(self.coeffs[0], IntegersModElement):
             coeffs = [coef.value for coef in self.coeffs]
             mod_str = f" (mod {self.coeffs[0].characteristic})"
         else:
@@ -93,13 +95,20 @@ class Polynomial:
             return self
         if not isinstance(other, Polynomial):
             raise TypeError("Both need to be polynomials")
-        deg_self = self.degree + 1
-        deg_other = other.degree + 1
-        tmp_poly = [0]*(deg_self + deg_other)
+        coeffs1 = self.coeffs[:self.degree + 1]
+        coeffs2 = other.coeffs[:other.degree + 1]
 
-        for i in range(deg_self):
-            for j in range(deg_other):
-                tmp_poly[i+j] += self.coeffs[i]*other.coeffs[j]
+        prime = _common_prime(coeffs1 + coeffs2)
+        if prime:
+            F = IntegersMod(prime)
+            product = poly_mul([i % prime for i in _values(coeffs1)],
+                               [i % prime for i in _values(coeffs2)], prime)
+            return Polynomial([F(i) for i in product] or [F(0)])
+
+        if min(len(coeffs1), len(coeffs2)) >= KARATSUBA_THRESHOLD:
+            tmp_poly = karatsuba_mul(coeffs1, coeffs2, KARATSUBA_THRESHOLD)
+        else:
+            tmp_poly = schoolbook_mul(coeffs1, coeffs2)
         return Polynomial(tmp_poly[:largest_index(tmp_poly) + 1])
     
     def __rmul__(self, other):
@@ -107,27 +116,59 @@ class Polynomial:
     
     def division(self, other):
         """Euclidian algorithm for polynomials
+
+        The leading coefficient of the divisor is inverted once if it has an
+        inverse() method. Over the integers modulo p the division runs on
+        integer coefficient lists, using a Newton iteration reciprocal for
+        large degrees.
         """
 
         if not isinstance(other, Polynomial):
             raise TypeError("Both need to be polynomials")
         if other == 0:
             raise ValueError("The divisor polynomial cannot be zero.")
-        
-        dividend = self.coeffs[::-1]
-        divisor = other.coeffs[::-1]
 
-        quotient = [0] * (self.degree - other.degree + 1)
+        dividend = self.coeffs[:self.degree + 1]
+        divisor = other.coeffs[:other.degree + 1]
+
+        prime = _common_prime(dividend + divisor)
+        if prime:
+            F = IntegersMod(prime)
+            quotient, remainder = poly_divmod(
+                [i % prime for i in _values(dividend)],
+                [i % prime for i in _values(divisor)], prime)
+            return Polynomial([F(i) for i in quotient] or [F(0)]), \
+                   Polynomial([F(i) for i in remainder] or [F(0)])
+
+        leading_coeff = divisor[-1]
+        lead_inv = leading_coeff.inverse() \
+            if hasattr(leading_coeff, "inverse") else None
+        deg_other = other.degree
         remainder = dividend[:]
-        
-        for i in range(self.degree - other.degree + 1):
-            leading_coeff = remainder[i] / divisor[0]
-            quotient[i] = leading_coeff
-            
-            for j in range(len(divisor)):
-                remainder[i + j] -= leading_coeff * divisor[j]
-        return Polynomial(quotient[::-1]), \
-               Polynomial(remainder[:largest_index(remainder)+1][::-1])
+        quotient = [0] * max(self.degree - deg_other + 1, 1)
+
+        for i in range(self.degree - deg_other, -1, -1):
+            if lead_inv is None:
+                coeff = remainder[i + deg_other] / leading_coeff
+            else:
+                coeff = remainder[i + deg_other] * lead_inv
+            quotient[i] = coeff
+            for j in range(deg_other + 1):
+                remainder[i + j] -= coeff * divisor[j]
+        remainder = remainder[:max(deg_other, 1)]
+        return Polynomial(quotient), \
+               Polynomial(remainder[:largest_index(remainder)+1])
+
+    def modulus(self):
+        """Returns a PrecomputedModulus for repeated reduction by this
+        polynomial. Coefficients must be integers modulo p.
+        """
+        prime = _common_prime(self.coeffs)
+        if not prime:
+            raise TypeError("Coefficients must be IntegersModElement")
+        return PrecomputedModulus(
+            [i % prime for i in _values(self.coeffs[:self.degree + 1])],
+            prime)
 
     def __truediv__(self, other):
         quotient, remainder = self.division(other)
@@ -139,6 +180,12 @@ class Polynomial:
         return self.division(other)[0]
     
     def __mod__(self, other):
+        if isinstance(other, PrecomputedModulus):
+            prime = other.p
+            F = IntegersMod(prime)
+            remainder = other.reduce(
+                [i % prime for i in _values(self.coeffs[:self.degree + 1])])
+            return Polynomial([F(i) for i in remainder] or [F(0)])
         return self.division(other)[1]
 
     def __eq__(self, other):
@@ -146,4 +193,23 @@ class Polynomial:
             return all([i == 0 for i in self.coeffs])
         if not isinstance(other, Polynomial):
             return False
-        return self - other == 0
\ No newline at end of file
+        return self - other == 0
+
+def _common_prime(coeffs: list):
+    """Returns p if the coefficients are IntegersModElement of a common
+    prime p, possibly mixed with integers, and None otherwise
+    """
+    prime = None
+    for coeff in coeffs:
+        if isinstance(coeff, IntegersModElement):
+            if prime is None:
+                prime = coeff.characteristic
+            elif coeff.characteristic != prime:
+                return None
+        elif not isinstance(coeff, int):
+            return None
+    return prime
+
+def _values(coeffs: list) -> list:
+    return [i.value if isinstance(i, IntegersModElement) else i
+            for i in coeffs]
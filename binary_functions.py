@@ -0,0 +1,159 @@
+"""Arithmetic on polynomials over F_2 packed into integers.
+
+Bit i of an integer is the coefficient of x^i, which is also the packed
+representation FieldElement uses for p = 2. Addition is XOR, and
+multiplication is carry-less multiplication of the integers.
+"""
+
+# Largest degree for which a dense modulus is reduced with byte tables
+BYTE_TABLE_MAX_DEGREE = 64
+
+# _SPREAD[b] has the bits of the byte b at the even positions, so that it
+# is the square of b as a polynomial over F_2
+_SPREAD = [sum((b >> i & 1) << 2*i for i in range(8)) for b in range(256)]
+
+
+def clmul(a: int, b: int) -> int:
+    """Returns the carry-less product of a and b
+
+    The longer operand is multiplied by 4 bit windows of the shorter one,
+    using a table of its 16 multiples.
+    """
+    if a.bit_length() < b.bit_length():
+        a, b = b, a
+    if b < 16:
+        result = 0
+        while b:
+            if b & 1:
+                result ^= a
+            a <<= 1
+            b >>= 1
+        return result
+    table = [0, a]
+    for i in range(2, 16):
+        table.append(table[i >> 1] << 1 if i & 1 == 0 else table[i - 1] ^ a)
+    result = 0
+    shift = 0
+    while b:
+        result ^= table[b & 15] << shift
+        b >>= 4
+        shift += 4
+    return result
+
+def clsquare(a: int) -> int:
+    """Returns the carry-less square of a, by spreading its bits apart
+    """
+    result = 0
+    shift = 0
+    while a:
+        result |= _SPREAD[a & 255] << shift
+        a >>= 8
+        shift += 16
+    return result
+
+def clmod(a: int, f: int) -> int:
+    """Returns a mod f by bitwise long division
+    """
+    degree = f.bit_length() - 1
+    while a.bit_length() > degree:
+        a ^= f << (a.bit_length() - 1 - degree)
+    return a
+
+def clgcd(a: int, b: int) -> int:
+    """Returns the greatest common divisor of a and b, by Euclid's algorithm
+    """
+    while b:
+        a, b = b, clmod(a, b)
+    return a
+
+def binary_inverse(a: int, f: int) -> int:
+    """Returns the inverse of a modulo f, using the binary extended
+    Euclidean algorithm
+
+    Raises ValueError if a and f are not coprime.
+    """
+    u, v = clmod(a, f), f
+    g1, g2 = 1, 0
+    while u > 1:
+        j = u.bit_length() - v.bit_length()
+        if j < 0:
+            u, v = v, u
+            g1, g2 = g2, g1
+            j = -j
+        u ^= v << j
+        g1 ^= g2 << j
+    if u == 0:
+        raise ValueError("Polynomials are not coprime")
+    return clmod(g1, f)
+
+
+class BinaryModulus:
+    """A fixed modulus f over F_2, packed into an integer, prepared for
+    repeated reduction of products of reduced operands
+
+    Sparse moduli (at most deg/2 terms below the leading one) are reduced
+    by shifting the excess bits onto the lower terms. Dense moduli up to
+    BYTE_TABLE_MAX_DEGREE use tables of x^(n+8k) b(x) mod f for every byte
+    b, so the excess is reduced one byte at a time. Other moduli fall back
+    to long division.
+    """
+
+    def __init__(self, f: int):
+        self.f = f
+        self.degree = f.bit_length() - 1
+        self.mask = (1 << self.degree) - 1
+        terms = [i for i in range(self.degree) if f >> i & 1]
+        self.terms = terms if 2*len(terms) <= self.degree else None
+        self.tables = None
+        if self.terms is None and self.degree <= BYTE_TABLE_MAX_DEGREE:
+            self.tables = [[clmod(b << (self.degree + 8*k), f)
+                            for b in range(256)]
+                           for k in range((self.degree + 6) // 8)]
+
+    def reduce(self, a: int) -> int:
+        """Returns a mod f
+        """
+        degree = self.degree
+        if self.terms is not None:
+            mask = self.mask
+            terms = self.terms
+            high = a >> degree
+            while high:
+                a &= mask
+                for t in terms:
+                    a ^= high << t
+                high = a >> degree
+            return a
+        if self.tables is not None and a.bit_length() < 2*degree:
+            result = a & self.mask
+            high = a >> degree
+            for table in self.tables:
+                if not high:
+                    break
+                result ^= table[high & 255]
+                high >>= 8
+            return result
+        return clmod(a, self.f)
+
+    def multiply(self, a: int, b: int) -> int:
+        """Returns a * b mod f for reduced a and b
+        """
+        if a == b:
+            return self.reduce(clsquare(a))
+        return self.reduce(clmul(a, b))
+
+def binary_is_irreducible(f: int) -> bool:
+    """Returns True if f is irreducible over F_2, by Ben-Or's test
+
+    x^(2^k) mod f is found by one squaring per step, and f is reducible
+    as soon as gcd(x^(2^k) - x, f) is not 1 for some k <= deg(f)/2.
+    """
+    modulus = BinaryModulus(f)
+    if modulus.degree < 1:
+        return False
+    h = 2
+    for _ in range(modulus.degree // 2):
+        h = modulus.reduce(clsquare(h))
+        if clgcd(f, h ^ 2) != 1:
+            return False
+    return True
@@ -0,0 +1,97 @@
+"""Registry of standard defining polynomials for finite fields
+
+Polynomials are written as {exponent: coefficient} and are all monic. The
+default modulus of F(p^n) is its Conway polynomial when one is listed and
+otherwise a listed sparse trinomial or pentanomial, so these fields never
+need a search for an irreducible polynomial. Moduli used by standards are
+also available by name.
+"""
+
+# Conway polynomials from Frank Lübeck's tables
+CONWAY_POLYS = {
+    (2, 1): {1: 1, 0: 1},
+    (2, 2): {2: 1, 1: 1, 0: 1},
+    (2, 3): {3: 1, 1: 1, 0: 1},
+    (2, 4): {4: 1, 1: 1, 0: 1},
+    (2, 5): {5: 1, 2: 1, 0: 1},
+    (2, 6): {6: 1, 4: 1, 3: 1, 1: 1, 0: 1},
+    (2, 7): {7: 1, 1: 1, 0: 1},
+    (2, 8): {8: 1, 4: 1, 3: 1, 2: 1, 0: 1},
+    (3, 1): {1: 1, 0: 1},
+    (3, 2): {2: 1, 1: 2, 0: 2},
+    (3, 3): {3: 1, 1: 2, 0: 1},
+    (3, 4): {4: 1, 3: 2, 0: 2},
+    (3, 5): {5: 1, 1: 2, 0: 1},
+    (3, 6): {6: 1, 4: 2, 2: 1, 1: 2, 0: 2},
+    (5, 1): {1: 1, 0: 3},
+    (5, 2): {2: 1, 1: 4, 0: 2},
+    (5, 3): {3: 1, 1: 3, 0: 3},
+    (5, 4): {4: 1, 2: 4, 1: 4, 0: 2},
+    (7, 1): {1: 1, 0: 4},
+    (7, 2): {2: 1, 1: 6, 0: 3},
+    (7, 3): {3: 1, 2: 6, 0: 4},
+}
+
+# Low weight irreducible polynomials over F_2, for fast reduction
+SPARSE_POLYS = {
+    (2, 16): {16: 1, 5: 1, 3: 1, 1: 1, 0: 1},
+    (2, 32): {32: 1, 7: 1, 3: 1, 2: 1, 0: 1},
+    (2, 64): {64: 1, 4: 1, 3: 1, 1: 1, 0: 1},
+    (2, 128): {128: 1, 7: 1, 2: 1, 1: 1, 0: 1},
+    (2, 163): {163: 1, 7: 1, 6: 1, 3: 1, 0: 1},
+    (2, 233): {233: 1, 74: 1, 0: 1},
+    (2, 283): {283: 1, 12: 1, 7: 1, 5: 1, 0: 1},
+    (2, 409): {409: 1, 87: 1, 0: 1},
+    (2, 571): {571: 1, 10: 1, 5: 1, 2: 1, 0: 1},
+}
+
+# Moduli fixed by standards, as (p, n, polynomial)
+NAMED_MODULI = {
+    "aes": (2, 8, {8: 1, 4: 1, 3: 1, 1: 1, 0: 1}),
+    "gcm": (2, 128, SPARSE_POLYS[(2, 128)]),
+    "b163": (2, 163, SPARSE_POLYS[(2, 163)]),
+    "b233": (2, 233, SPARSE_POLYS[(2, 233)]),
+    "b283": (2, 283, SPARSE_POLYS[(2, 283)]),
+    "b409": (2, 409, SPARSE_POLYS[(2, 409)]),
+    "b571": (2, 571, SPARSE_POLYS[(2, 571)]),
+}
+
+_default_moduli = {**SPARSE_POLYS, **CONWAY_POLYS}
+
+
+def to_coeffs(terms: dict, degree: int) -> list:
+    """Returns the coefficient list, a_0 first, of a polynomial given as
+    {exponent: coefficient}
+    """
+    coeffs = [0]*(degree + 1)
+    for exponent, coeff in terms.items():
+        coeffs[exponent] = coeff
+    return coeffs
+
+def default_modulus(prime: int, degree: int):
+    """Returns the coefficients of the registered modulus of F(p^n), or None
+    if no modulus is registered
+    """
+    terms = _default_moduli.get((prime, degree))
+    return None if terms is None else to_coeffs(terms, degree)
+
+def named_modulus(name: str):
+    """Returns (p, n, coefficients) for a modulus in NAMED_MODULI
+    """
+    if name not in NAMED_MODULI:
+        raise ValueError(f"Unknown modulus {name}")
+    prime, degree, terms = NAMED_MODULI[name]
+    return prime, degree, to_coeffs(terms, degree)
+
+def register_modulus(prime: int, degree: int, coeffs: list):
+    """Registers a monic polynomial, given by its coefficients a_0 first, as
+    the default modulus of F(p^n)
+
+    Only fields whose defining polynomial has not been looked up yet pick
+    up the new modulus. The polynomial is not checked for irreducibility.
+    """
+    if len(coeffs) != degree + 1 or coeffs[-1] % prime != 1:
+        raise ValueError(f"Modulus must be monic of degree {degree}")
+    _default_moduli[(prime, degree)] = {i: c % prime
+                                        for i, c in enumerate(coeffs)
+                                        if c % prime}
@@ -1,24 +1,224 @@
 from configparser import ConfigParser
-from math import sqrt
+from functools import lru_cache
+from math import gcd, isqrt
 
 config = ConfigParser()
 config.read("config.cfg")
 
 IRREDUCIBLE_POLYS_PATH = str(config.get("General", "IRREDUCIBLE_POLYS_PATH"))
-ALWAYS_REDUCE = (config.get("General", "ALWAYS_REDUCE") == "True")
+IRREDUCIBLE_WORKERS = int(config.get("General", "IRREDUCIBLE_WORKERS"))
+POLY_CACHE_SIZE = int(config.get("General", "POLY_CACHE_SIZE"))
+LOG_TABLE_MAX_SIZE = int(config.get("General", "LOG_TABLE_MAX_SIZE"))
+KARATSUBA_THRESHOLD = int(config.get("General", "KARATSUBA_THRESHOLD"))
+KRONECKER_THRESHOLD = int(config.get("General", "KRONECKER_THRESHOLD"))
+NEWTON_DIVISION_THRESHOLD = int(config.get("General",
+                                           "NEWTON_DIVISION_THRESHOLD"))
+STRASSEN_THRESHOLD = int(config.get("General", "STRASSEN_THRESHOLD"))
 
 def isPrime(n: int) -> bool:
-    if n == 2:
+    """Returns True if n is prime
+
+    Results are memoized per n. Numbers below 3.3 * 10^24 are decided
+    exactly by Miller-Rabin with fixed bases, larger ones by the
+    Baillie-PSW test, for which no counterexample is known.
+    """
+    if not isinstance(n, int) or n < 2:
+        return False
+    return _is_prime(n)
+
+@lru_cache(maxsize=1024)
+def _is_prime(n: int) -> bool:
+    for p in SMALL_PRIMES:
+        if n % p == 0:
+            return n == p
+    if n < SMALL_PRIMES[-1]**2:
+        return True
+    if n < _MILLER_RABIN_BOUND:
+        return all(_miller_rabin(n, a) for a in _MILLER_RABIN_BASES)
+    return _miller_rabin(n, 2) and _strong_lucas(n)
+
+def _primes_below(bound: int) -> tuple:
+    sieve = bytearray([1])*bound
+    sieve[:2] = b"\x00\x00"
+    for i in range(2, isqrt(bound - 1) + 1):
+        if sieve[i]:
+            sieve[i*i::i] = bytes(len(range(i*i, bound, i)))
+    return tuple(i for i in range(bound) if sieve[i])
+
+SMALL_PRIMES = _primes_below(1000)
+_MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_MILLER_RABIN_BOUND = 3317044064679887385961981
+
+def _miller_rabin(n: int, a: int) -> bool:
+    """Returns True if the odd number n is a strong probable prime to
+    base a
+    """
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1:
         return True
-    if (not isinstance(n, int)) or n<0 or n%2 == 0:
+    for _ in range(s - 1):
+        x = x*x % n
+        if x == n - 1:
+            return True
+    return False
+
+def _jacobi(a: int, n: int) -> int:
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+def _strong_lucas(n: int) -> bool:
+    """Returns True if the odd number n is a strong Lucas probable prime,
+    with the parameters chosen by Selfridge's method
+    """
+    if isqrt(n)**2 == n:
         return False
-    for i in range(3, int(sqrt(n))+1, 2):
-        if n%i == 0:
+    D = 5
+    while _jacobi(D, n) != -1:
+        if _jacobi(D, n) == 0 and abs(D) != n:
             return False
-    return True
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+    d = n + 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    def halve(x):
+        x %= n
+        return (x + n if x & 1 else x) // 2
+
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U, V = U*V % n, (V*V - 2*Qk) % n
+        Qk = Qk*Qk % n
+        if bit == "1":
+            U, V = halve(P*U + V), halve(D*U + P*V)
+            Qk = Qk*Q % n
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V*V - 2*Qk) % n
+        Qk = Qk*Qk % n
+        if V == 0:
+            return True
+    return False
+
+def factor(n: int) -> dict:
+    """Returns the prime factorization of n as a dictionary {prime: exponent}
+
+    Factors below 1000 are removed by trial division, the rest is split
+    with the Pollard-Brent rho method.
+    """
+    factors = {}
+    for p in SMALL_PRIMES:
+        if p*p > n:
+            break
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+    stack = [n] if n > 1 else []
+    while stack:
+        m = stack.pop()
+        if _is_prime(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        d = _pollard_brent(m)
+        stack += [d, m // d]
+    return dict(sorted(factors.items()))
+
+def _pollard_brent(n: int) -> int:
+    """Returns a nontrivial factor of the composite n, which has no
+    factors below 1000
+
+    Brent's variant of Pollard's rho: the cycle is found by comparing
+    against saved points at powers of two, and gcds are taken of products
+    of m differences at a time.
+    """
+    m = 128
+    c = 1
+    while True:
+        y, r, q = 2, 1, 1
+        g = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y*y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y*y + c) % n
+                    q = q*abs(x - y) % n
+                g = gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys*ys + c) % n
+                g = gcd(abs(x - ys), n)
+        if g != n:
+            return g
+        c += 1
 
 def largest_index(lst: list):
     for i in range(len(lst)-1, 0, -1):
         if lst[i] != 0:
             return i
-    return 0
\ No newline at end of file
+    return 0
+
+def int_to_digits(value: int, base: int, length: int = 0) -> list:
+    """Returns the base 'base' digits of value, least significant first,
+    padded with zeros to at least 'length' digits
+    """
+    if base == 2:
+        digits = [int(bit) for bit in bin(value)[:1:-1]] if value else []
+    else:
+        digits = []
+        while value:
+            value, digit = divmod(value, base)
+            digits.append(digit)
+    if len(digits) < length:
+        digits += [0]*(length - len(digits))
+    return digits
+
+def digits_to_int(digits: list, base: int) -> int:
+    """Packs a list of base 'base' digits, least significant first, into
+    an integer
+    """
+    if base == 2:
+        return int("".join("1" if d else "0" for d in reversed(digits)) or "0",
+                   2)
+    value = 0
+    for digit in reversed(digits):
+        value = value*base + digit
+    return value
+
+def monic_index(coeffs: list, prime: int) -> int:
+    """Returns the counter value of a monic polynomial over F_p, given by
+    its integer coefficients a_0 first: the base p number with digits
+    a_0 ... a_(n-1), a_0 being the most significant
+    """
+    return digits_to_int(coeffs[-2::-1], prime)
+
+def monic_from_index(index: int, prime: int, degree: int) -> list:
+    """Returns the integer coefficients of the monic polynomial of degree
+    'degree' over F_p with the given counter value
+    """
+    return int_to_digits(index, prime, degree)[::-1] + [1]
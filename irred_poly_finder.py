@@ -1,131 +1,353 @@
-from math import sqrt
-import os
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+import random
 
 from IntegersModP import IntegersMod
 from Polynomial import Polynomial
-from finitefield_functions import IRREDUCIBLE_POLYS_PATH
+from finitefield_functions import IRREDUCIBLE_POLYS_PATH, \
+                                  IRREDUCIBLE_WORKERS, POLY_CACHE_SIZE, \
+                                  monic_index, monic_from_index
+from irred_poly_store import IrreduciblePolyStore
+from polynomial_functions import poly_is_irreducible, PrecomputedModulus
+
+# Smallest number of candidates for which a process pool is used
+PARALLEL_MIN_CANDIDATES = 1 << 12
+
+
+class PolyCache:
+    """Least recently used cache of the irreducible polynomials of one
+    degree, keyed by (folder, p, degree) and holding at most 'maxsize'
+    degrees
+
+    The cached Polynomial objects are shared, so readers of the cache hand
+    out copies of them.
+
+    Only complete lists are cached. Entries are dropped with invalidate()
+    when the store changes, and the hit and miss counts are returned by
+    info().
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Returns the cached tuple of polynomials for the key, or None
+        """
+        polys = self._entries.get(key)
+        if polys is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return polys
+
+    def put(self, key, polys):
+        self._entries[key] = tuple(polys)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, prime: int = None, degree: int = None):
+        """Drops the entries for the given prime and degree, or all entries
+        matching the ones given
+        """
+        for key in list(self._entries):
+            if (prime is None or key[1] == prime) and \
+                    (degree is None or key[2] == degree):
+                del self._entries[key]
+
+    def info(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses,
+                "size": len(self._entries), "maxsize": self.maxsize}
+
+
+# Process wide cache used by modulo_method and read_poly_from_file
+POLY_CACHE = PolyCache(POLY_CACHE_SIZE)
 
 
 def gen_all_polys(degree, field):
     """
     Generates all monic polynomials of degree 'degree' over the given field
     """
-    all_polys = []
-    field_elements = field.elements()
+    return list(iter_all_polys(degree, field))
+
+def iter_all_polys(degree, field):
+    """Yields all monic polynomials of degree 'degree' over the integers
+    modulo p one at a time, in the same order as gen_all_polys
+    """
+    for coeffs in iter_monic_coeffs(degree, field.characteristic):
+        yield Polynomial([field(i) for i in coeffs])
+
+def iter_monic_coeffs(degree: int, prime: int, start: int = 0,
+                      stop: int = None):
+    """Yields the integer coefficient lists of all monic polynomials of
+    degree 'degree' over F_p
+
+    The coefficients below the leading one are a base p counter with a_0 as
+    its most significant digit, so a_0 changes slowest. Only one list is
+    kept and a copy of it is yielded at every step. 'start' and 'stop'
+    restrict the output to the candidates with those counter values.
+    """
+    if stop is None:
+        stop = prime**degree
+    coeffs = monic_from_index(start, prime, degree)
+    for _ in range(start, stop):
+        yield coeffs[:]
+        i = degree - 1
+        while i >= 0 and coeffs[i] == prime - 1:
+            coeffs[i] = 0
+            i -= 1
+        if i >= 0:
+            coeffs[i] += 1
+
+def iter_irreducible_coeffs(degree: int, field,
+                            workers: int = IRREDUCIBLE_WORKERS,
+                            file_folder = IRREDUCIBLE_POLYS_PATH):
+    """Yields the integer coefficient lists of the monic irreducible
+    polynomials of degree 'degree' over F_p, in enumeration order
+
+    Candidates are produced lazily and trial divided by the irreducibles
+    of degree at most degree/2, so only those are held in memory. With
+    more than one worker the candidate counter range is split into shards
+    that are sieved in a process pool, and the shards are yielded in
+    order, so the output is the same as with one worker. The divisors
+    are taken from, and stored in, the store in 'file_folder'.
+    """
+    prime = field.characteristic
+    divisors = []
+    if degree > 1:
+        divisors = [q.modulus().f for q in
+                    modulo_method(degree // 2, field, workers, file_folder)]
+    total = prime**degree
+    if workers <= 1 or total < PARALLEL_MIN_CANDIDATES:
+        yield from _sieve_range(prime, degree, 0, total, divisors)
+        return
+
+    shard_size = -(-total // (4*workers))
+    starts = range(0, total, shard_size)
+    stops = [min(start + shard_size, total) for start in starts]
+    with ProcessPoolExecutor(workers) as executor:
+        shards = executor.map(_sieve_shard, [prime]*len(starts),
+                              [degree]*len(starts), starts, stops,
+                              [divisors]*len(starts))
+        for indices in shards:
+            for index in indices:
+                yield monic_from_index(index, prime, degree)
+
+def _sieve_range(prime: int, degree: int, start: int, stop: int,
+                 divisors: list):
+    moduli = [PrecomputedModulus(q, prime) for q in divisors]
+    for coeffs in iter_monic_coeffs(degree, prime, start, stop):
+        if all(q.reduce(coeffs) for q in moduli):
+            yield coeffs
+
+def _sieve_shard(prime: int, degree: int, start: int, stop: int,
+                 divisors: list) -> list:
+    """Returns the counter values of the irreducible candidates in
+    [start, stop), as a compact result for the process pool
+    """
+    return [monic_index(coeffs, prime)
+            for coeffs in _sieve_range(prime, degree, start, stop, divisors)]
 
-    def set_coeffs(poly, deg):
-        if deg == degree:
-            all_polys.append(poly+[field.identity()])
-            return
-        for i in field_elements:
-            set_coeffs(poly+[i], deg+1)
+def stream_irreducible_polys(degree: int, field,
+                             file_folder = IRREDUCIBLE_POLYS_PATH,
+                             workers: int = IRREDUCIBLE_WORKERS):
+    """Yields the monic irreducible polynomials of degree 'degree' over the
+    integers modulo p one at a time
 
-    set_coeffs([],0)
-    return [Polynomial(p) for p in all_polys]
+    Degrees already in the store are read from it. Otherwise the
+    polynomials are enumerated lazily and collected by a store writer as
+    they are yielded, and added to the store when the enumeration
+    completes.
+    """
+    store = IrreduciblePolyStore(field.characteristic, file_folder)
+    if store.count(degree) is not None:
+        for coeffs in store.iter_degree(degree):
+            yield Polynomial([field(i) for i in coeffs])
+        return
+
+    with store.writer(degree) as writer:
+        for coeffs in iter_irreducible_coeffs(degree, field, workers,
+                                              file_folder):
+            writer.write(coeffs)
+            yield Polynomial([field(i) for i in coeffs])
+
+def is_irreducible(poly: Polynomial) -> bool:
+    """Returns True if the polynomial is irreducible over its coefficient
+    field F_p, using Ben-Or's test instead of trial division
+    """
+    modulus = poly.modulus()
+    return poly_is_irreducible(modulus.f, modulus.p)
+
+def find_irreducible(prime: int, degree: int) -> Polynomial:
+    """Returns a monic irreducible polynomial of degree 'degree' over F_p
+
+    Sparse candidates are tried first: binomials and trinomials with small
+    coefficients and, for p = 2, pentanomials, since they make reduction
+    cheap. If none of these is irreducible, random monic polynomials are
+    sampled. The random generator is seeded, so the result only depends
+    on p and the degree.
+    """
+    for coeffs in _sparse_candidates(prime, degree):
+        if poly_is_irreducible(coeffs, prime):
+            return _to_polynomial(coeffs, prime)
+    return random_irreducible(prime, degree, random.Random(prime*degree))
+
+def random_irreducible(prime: int, degree: int, rng = random) -> Polynomial:
+    """Returns a random monic irreducible polynomial of degree 'degree' over
+    F_p
+
+    About one in 'degree' monic polynomials is irreducible, so the expected
+    number of samples is O(degree).
+    """
+    while True:
+        coeffs = [rng.randrange(prime) for _ in range(degree)] + [1]
+        if poly_is_irreducible(coeffs, prime):
+            return _to_polynomial(coeffs, prime)
+
+def _sparse_candidates(prime: int, degree: int):
+    small = range(1, min(prime, 17))
+    for b in small:
+        yield [b] + [0]*(degree - 1) + [1]
+    # By Swan's theorem no trinomial over F_2 of degree divisible by 8 is
+    # irreducible
+    trinomial_degrees = range(0) if prime == 2 and degree % 8 == 0 \
+                        else range(1, degree)
+    for k in trinomial_degrees:
+        for a in small:
+            for b in small:
+                coeffs = [b] + [0]*(degree - 1) + [1]
+                coeffs[k] = a
+                yield coeffs
+    if prime == 2:
+        for k1 in range(3, degree):
+            for k2 in range(2, k1):
+                for k3 in range(1, k2):
+                    coeffs = [1] + [0]*(degree - 1) + [1]
+                    coeffs[k1] = coeffs[k2] = coeffs[k3] = 1
+                    yield coeffs
+
+def _to_polynomial(coeffs: list, prime: int) -> Polynomial:
+    F = IntegersMod(prime)
+    return Polynomial([F(i) for i in coeffs])
 
 def write_poly_to_file(polys, file_folder = IRREDUCIBLE_POLYS_PATH):
+    """Adds the given monic polynomials, all of the same degree over the
+    same F_p, to the store as the polynomials of that degree
+    """
     prime = (polys[0].coeffs)[0].characteristic
-    poly_deg = polys[0].degree
-    path = f'./{file_folder}/irred_polys_{prime}.txt'
-    poly_line = f'{poly_deg}:'+";".join([",".join([str(i.value) for i in p.coeffs]) for p in polys])+"\n"
-
-    if os.path.exists(path) and os.path.getsize(path) > 0:
-        with open(path, "r") as file:
-            for line in file:
-                pass
-            last_written_deg = int(line[0])
-
-        if poly_deg > last_written_deg:
-            with open(path, "a") as file:
-                file.write(poly_line)
-    else:
-        if not os.path.exists(f"./{file_folder}"):
-            os.makedirs(f"./{file_folder}")
-        with open(path, "x") as file:
-            file.write(poly_line)
+    store = IrreduciblePolyStore(prime, file_folder)
+    with store.writer(polys[0].degree) as writer:
+        for p in polys:
+            writer.write([i.value for i in p.coeffs[:p.degree + 1]])
+    POLY_CACHE.invalidate(prime, polys[0].degree)
 
 def read_poly_from_file(prime, degree, file_folder = IRREDUCIBLE_POLYS_PATH):
-    path = f'./{file_folder}/irred_polys_{prime}.txt'
-    irred_polys = []
-    F = IntegersMod(prime)
-    i = 0
+    """Returns the stored polynomials of degree 'degree' over F_p, or an
+    empty list if the degree is not in the store
+    """
+    key = (file_folder, prime, degree)
+    polys = POLY_CACHE.get(key)
+    if polys is None:
+        F = IntegersMod(prime)
+        store = IrreduciblePolyStore(prime, file_folder)
+        polys = [Polynomial([F(i) for i in coeffs])
+                 for coeffs in store.iter_degree(degree)]
+        if polys:
+            POLY_CACHE.put(key, polys)
+    return _copies(polys)
 
-    if os.path.exists(path):
-        with open(path, "r") as file:
-            for line in file:
-                i += 1
-                if i == degree:                 
-                    deg_k_polys_str = line.split(":")[1]
-                    deg_k_polys_list = deg_k_polys_str.split(";")
-                    irred_polys = [Polynomial([F(int(j)) for j in p.split(",")]) for p in deg_k_polys_list]
-                if i > degree:
-                    break
+def modulo_method(degree: int, field, workers: int = IRREDUCIBLE_WORKERS,
+                  file_folder = IRREDUCIBLE_POLYS_PATH):
+    """
+    Returns a list of all irreducible polynomials up to degree 'degree',
+    by checking, for all polynomials p(x) of degree k, if q(x) divides
+    p(x) for any irreducible polynomial q(x) of degree at most k/2
+
+    'workers' is the number of processes used to sieve each degree. The
+    polynomials of every degree are read from and added to the store in
+    'file_folder', and kept in POLY_CACHE once found.
+    """
+    irreducible_polys = []
+    for k in range(1, degree + 1):
+        key = (file_folder, field.characteristic, k)
+        polys = POLY_CACHE.get(key)
+        if polys is None:
+            polys = list(stream_irreducible_polys(k, field, file_folder,
+                                                  workers))
+            POLY_CACHE.put(key, polys)
+        irreducible_polys += _copies(polys)
+    return irreducible_polys
 
-    return irred_polys, i
-    
+def _copies(polys) -> list:
+    return [Polynomial(poly.coeffs[:]) for poly in polys]
 
-def modulo_method(degree: int, field):
+def sieve_element_method(degree: int, field):
     """
     Returns a list of all irreducible polynomials up to degree 'degree',
-    by checking, for all polynomials p(x) of degree 'degree', if
-    q(x) divides p(x) for any irreducible polynomial q(x) of lower degree
+    by crossing out all monic multiples q(x)r(x) of the irreducible
+    polynomials q(x) of degree at most k/2, for every degree k
     """
+    prime = field.characteristic
+    irreducible_coeffs = []
+    for k in range(1, degree + 1):
+        divisors = [q for q in irreducible_coeffs if len(q) - 1 <= k // 2]
+        irreducible_coeffs += sieve_degree(k, prime, divisors)
+    return [Polynomial([field(i) for i in coeffs])
+            for coeffs in irreducible_coeffs]
 
-    saved_polys = read_poly_from_file(field.characteristic, degree)[0]
-    irreducible_polys = saved_polys
-    lower_deg_irred_polys = []
+def sieve_degree(degree: int, prime: int, divisors: list) -> list:
+    """Returns the coefficient lists of the monic polynomials of degree
+    'degree' over F_p that are not multiples of any of the monic
+    polynomials in 'divisors', in enumeration order
 
-    if degree > 1:
-        lower_deg_irred_polys = modulo_method(degree-1, field)
-
-    if saved_polys == []: #If there are no polys of spesified degree in file
-        deg_k_polys = gen_all_polys(degree, field)
-        if degree == 1:
-            write_poly_to_file(deg_k_polys)
-            return deg_k_polys
-        
-        lower_deg_irred_polys = modulo_method(degree-1, field) #kanskje noe redundencies her med tanke på cutoff-en
-
-        cutoff = int(sqrt(degree))
-        polys_to_check = [p for p in lower_deg_irred_polys if p.degree <= cutoff]
-        
-        irreducible_polys = []
-        for p in deg_k_polys:
-            if all(p % q != 0 for q in polys_to_check): 
-                irreducible_polys.append(p)
-        
-        write_poly_to_file(irreducible_polys)
-
-    return lower_deg_irred_polys + irreducible_polys
+    Every candidate is a byte in a table indexed by its counter value, as
+    in iter_monic_coeffs. The monic multiples q(x)r(x) of each divisor are
+    walked by counting through r(x): every step adds q(x)x^j for some j,
+    which changes deg(q) + 1 coefficients and hence the index by a few
+    additions, so each multiple is crossed out in O(deg(q)) time.
+    """
+    composite = bytearray(prime**degree)
+    weights = [prime**(degree - 1 - i) for i in range(degree)]
+    for q in divisors:
+        cofactor_degree = degree - (len(q) - 1)
+        product = [0]*cofactor_degree + q
+        index = sum(c*w for c, w in zip(product, weights))
+        r = [0]*cofactor_degree
+        while True:
+            composite[index] = 1
+            j = 0
+            while j < cofactor_degree and r[j] == prime - 1:
+                r[j] = 0
+                index += _add_shifted(product, q, j, weights, prime)
+                j += 1
+            if j == cofactor_degree:
+                break
+            r[j] += 1
+            index += _add_shifted(product, q, j, weights, prime)
 
-def sieve_element_method(degree: int, field):
-    # Bare om det går an å sile med hensyn til indeksering. Tar jo O(n) å fjerne p fra deg_k_polys
-
-    deg_k_polys = gen_all_polys(degree, field)
-    if degree == 1:
-        return deg_k_polys
-    
-    lower_deg_irred_polys = sieve_element_method(degree-1, field)
-
-    cutoff = int(sqrt(degree))
-    polys_to_check = [p for p in lower_deg_irred_polys if p.degree <= cutoff]
-    
-    i = 0
-    k = len(deg_k_polys)
-    while i < k:
-        p = deg_k_polys[i]
-        is_irred = True
-        for q in polys_to_check:
-            if p%q==0:
-                is_irred = False
-                while True:
-                    try:
-                        deg_k_polys.remove(p)
-                        k -= 1
-                        p += q
-                    except:
-                        break                    
-        if is_irred:
-            i+=1
-        
-    return lower_deg_irred_polys + deg_k_polys
\ No newline at end of file
+    survivors = []
+    index = composite.find(0)
+    while index != -1:
+        survivors.append(monic_from_index(index, prime, degree))
+        index = composite.find(0, index + 1)
+    return survivors
+
+def _add_shifted(product: list, q: list, shift: int, weights: list,
+                 prime: int) -> int:
+    """Adds q(x)x^shift to the product in place, below its leading term,
+    and returns the resulting change of its index
+    """
+    change = 0
+    for i in range(len(q)):
+        position = i + shift
+        if position >= len(weights):
+            break
+        old = product[position]
+        new = (old + q[i]) % prime
+        product[position] = new
+        change += (new - old)*weights[position]
+    return change
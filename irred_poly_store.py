@@ -0,0 +1,208 @@
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+import mmap
+import os
+import struct
+import tempfile
+
+from finitefield_functions import IRREDUCIBLE_POLYS_PATH, monic_index, \
+                                  monic_from_index
+
+MAGIC = b"IRRP"
+VERSION = 1
+# Largest degree that can be stored
+MAX_DEGREE = 255
+
+_HEADER = struct.Struct("<4sII")
+_ENTRY = struct.Struct("<QQ")
+_INDEX_START = _HEADER.size
+_DATA_START = _INDEX_START + (MAX_DEGREE + 1)*_ENTRY.size
+
+
+class IrreduciblePolyStore:
+    """Binary store of the monic irreducible polynomials over F_p, in the
+    file irred_polys_<p>.bin of the given folder
+
+    The file starts with a header and an index holding (offset, count) for
+    every degree up to MAX_DEGREE, with offset 0 for degrees not stored.
+    A polynomial of degree n is stored as its counter value (see
+    monic_index) in a little endian record of fixed width, the number of
+    bytes needed for p^n - 1. The k-th polynomial of a degree is read in
+    O(1) through a memory map of the file.
+
+    New degrees are appended under an exclusive file lock, and the index
+    entry is only written after the records, so several processes can
+    fill the same store. Readers take a shared lock to read the index.
+    Locking needs fcntl and is skipped where it is not available.
+    """
+
+    def __init__(self, prime: int, file_folder = IRREDUCIBLE_POLYS_PATH):
+        self.prime = prime
+        self.folder = file_folder
+        self.path = f'./{file_folder}/irred_polys_{prime}.bin'
+        self._map = None
+        self._entries = {}
+
+    def width(self, degree: int) -> int:
+        """Returns the number of bytes of a record of degree 'degree'
+        """
+        return ((self.prime**degree - 1).bit_length() + 7) // 8 or 1
+
+    def count(self, degree: int):
+        """Returns the number of stored polynomials of degree 'degree', or
+        None if the degree is not in the store
+        """
+        entry = self._entry(degree)
+        return None if entry is None else entry[1]
+
+    def get(self, degree: int, k: int) -> list:
+        """Returns the coefficients of the k-th stored polynomial of degree
+        'degree'
+        """
+        entry = self._entry(degree)
+        if entry is None or not 0 <= k < entry[1]:
+            raise IndexError(f"No polynomial {k} of degree {degree} stored")
+        width = self.width(degree)
+        start = entry[0] + k*width
+        value = int.from_bytes(self._map[start:start + width], "little")
+        return monic_from_index(value, self.prime, degree)
+
+    def iter_degree(self, degree: int):
+        """Yields the coefficients of all stored polynomials of degree
+        'degree', in the order they were written
+        """
+        entry = self._entry(degree)
+        if entry is None:
+            return
+        offset, count = entry
+        width = self.width(degree)
+        for start in range(offset, offset + count*width, width):
+            value = int.from_bytes(self._map[start:start + width], "little")
+            yield monic_from_index(value, self.prime, degree)
+
+    def writer(self, degree: int):
+        """Returns a context manager whose write(coeffs) method collects
+        polynomials of degree 'degree'. They are added to the store when
+        the context exits without an exception.
+        """
+        if not 1 <= degree <= MAX_DEGREE:
+            raise ValueError(f"Degree {degree} cannot be stored")
+        return _StoreWriter(self, degree)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._entries = {}
+
+    def _entry(self, degree: int):
+        if degree in self._entries:
+            return self._entries[degree]
+        if not 1 <= degree <= MAX_DEGREE or not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as file:
+            _lock(file, shared=True)
+            try:
+                size = os.fstat(file.fileno()).st_size
+                if size < _DATA_START:
+                    return None
+                if self._map is None or size > len(self._map):
+                    self.close()
+                    self._map = mmap.mmap(file.fileno(), 0,
+                                          access=mmap.ACCESS_READ)
+                    _check_header(self._map[:_HEADER.size], self.path)
+                start = _INDEX_START + degree*_ENTRY.size
+                offset, count = _ENTRY.unpack(
+                    self._map[start:start + _ENTRY.size])
+            finally:
+                _unlock(file)
+        if offset == 0:
+            return None
+        self._entries[degree] = (offset, count)
+        return offset, count
+
+    def _append(self, degree: int, records_file, count: int):
+        """Appends the records in records_file as the polynomials of degree
+        'degree', unless another process stored that degree first
+        """
+        os.makedirs(f"./{self.folder}", exist_ok=True)
+        with open(self.path, "a+b") as file:
+            _lock(file, shared=False)
+            try:
+                file.seek(0, os.SEEK_END)
+                if file.tell() == 0:
+                    file.write(_HEADER.pack(MAGIC, VERSION, MAX_DEGREE))
+                    file.write(bytes(_DATA_START - _HEADER.size))
+                    file.flush()
+                file.seek(0)
+                _check_header(file.read(_HEADER.size), self.path)
+                start = _INDEX_START + degree*_ENTRY.size
+                file.seek(start)
+                if _ENTRY.unpack(file.read(_ENTRY.size))[0] != 0:
+                    return
+                file.seek(0, os.SEEK_END)
+                offset = file.tell()
+                records_file.seek(0)
+                while True:
+                    chunk = records_file.read(1 << 20)
+                    if not chunk:
+                        break
+                    file.write(chunk)
+                file.flush()
+                os.fsync(file.fileno())
+                # Publish the degree only once its records are on disk. The
+                # index is rewritten in place, so it needs a second handle
+                # that is not in append mode.
+                with open(self.path, "r+b") as index_file:
+                    index_file.seek(start)
+                    index_file.write(_ENTRY.pack(offset, count))
+                    index_file.flush()
+                    os.fsync(index_file.fileno())
+            finally:
+                _unlock(file)
+
+
+class _StoreWriter:
+    """Collects records for one degree in a temporary file, so the store
+    is only locked for the final copy
+    """
+
+    def __init__(self, store: IrreduciblePolyStore, degree: int):
+        self.store = store
+        self.degree = degree
+        self.width = store.width(degree)
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        self._file = tempfile.TemporaryFile()
+        return self
+
+    def write(self, coeffs: list):
+        value = monic_index(coeffs, self.store.prime)
+        self._file.write(value.to_bytes(self.width, "little"))
+        self.count += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.store._append(self.degree, self._file, self.count)
+        finally:
+            self._file.close()
+        return False
+
+
+def _check_header(header: bytes, path: str):
+    magic, version, max_degree = _HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION or max_degree != MAX_DEGREE:
+        raise ValueError(f"{path} is not an irreducible polynomial store")
+
+def _lock(file, shared: bool):
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+
+def _unlock(file):
+    if fcntl is not None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,351 @@
+"""Arithmetic on polynomials over F_p stored as plain lists of integers.
+
+Coefficients are ordered as in Polynomial, a_0 first, and are assumed to be
+reduced modulo p. These kernels avoid allocating IntegersModElement objects
+and are shared by FieldElement and the polynomial utilities.
+"""
+
+from binary_functions import binary_is_irreducible
+from finitefield_functions import KRONECKER_THRESHOLD, \
+                                  NEWTON_DIVISION_THRESHOLD
+
+
+def poly_trim(a: list) -> list:
+    """Removes trailing zero coefficients in place and returns the list
+    """
+    while a and a[-1] == 0:
+        a.pop()
+    return a
+
+def poly_add(a: list, b: list, p: int) -> list:
+    """Returns a + b mod p
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    result = a[:]
+    for i, coeff in enumerate(b):
+        result[i] = (result[i] + coeff) % p
+    return poly_trim(result)
+
+def poly_sub(a: list, b: list, p: int) -> list:
+    """Returns a - b mod p
+    """
+    result = a + [0]*(len(b) - len(a))
+    for i, coeff in enumerate(b):
+        result[i] = (result[i] - coeff) % p
+    return poly_trim(result)
+
+def poly_mul(a: list, b: list, p: int) -> list:
+    """Returns a * b mod p
+
+    Uses schoolbook multiplication for short inputs and Kronecker
+    substitution (a single big integer multiplication) from
+    KRONECKER_THRESHOLD coefficients. Kronecker substitution is already
+    faster than Karatsuba at that size, so Karatsuba is only used for
+    coefficients that are not residues modulo p (see Polynomial).
+    """
+    if not a or not b:
+        return []
+    if min(len(a), len(b)) >= KRONECKER_THRESHOLD:
+        product = kronecker_mul(a, b, p)
+    else:
+        product = schoolbook_mul(a, b)
+    return poly_trim([coeff % p for coeff in product])
+
+def schoolbook_mul(a: list, b: list) -> list:
+    """Returns the product of two coefficient lists without any modular
+    reduction. Works for any coefficients supporting + and *.
+    """
+    if not a or not b:
+        return []
+    result = [0]*(len(a) + len(b) - 1)
+    for i, coeff in enumerate(a):
+        for j, other in enumerate(b):
+            result[i+j] += coeff*other
+    return result
+
+def karatsuba_mul(a: list, b: list, threshold: int = 2) -> list:
+    """Returns the product of two coefficient lists by Karatsuba
+    multiplication, falling back to schoolbook multiplication below
+    'threshold' coefficients. Works for any coefficients supporting
+    +, - and *.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if len(b) < max(threshold, 2):
+        return schoolbook_mul(a, b)
+    if 2*len(b) <= len(a):
+        # Unbalanced: multiply b by slices of a of the same length
+        result = [0]*(len(a) + len(b) - 1)
+        for start in range(0, len(a), len(b)):
+            part = karatsuba_mul(a[start:start+len(b)], b, threshold)
+            for i, coeff in enumerate(part):
+                result[start+i] += coeff
+        return result
+
+    m = len(a) // 2
+    a0, a1 = a[:m], a[m:]
+    b0, b1 = b[:m], b[m:]
+    z0 = karatsuba_mul(a0, b0, threshold)
+    z2 = karatsuba_mul(a1, b1, threshold)
+    z1 = karatsuba_mul(_add_lists(a0, a1), _add_lists(b0, b1), threshold)
+    for i, coeff in enumerate(z0):
+        z1[i] = z1[i] - coeff
+    for i, coeff in enumerate(z2):
+        z1[i] = z1[i] - coeff
+
+    result = [0]*(len(a) + len(b) - 1)
+    for i, coeff in enumerate(z0):
+        result[i] += coeff
+    for i, coeff in enumerate(z1):
+        result[i+m] += coeff
+    for i, coeff in enumerate(z2):
+        result[i+2*m] += coeff
+    return result
+
+def kronecker_mul(a: list, b: list, p: int) -> list:
+    """Returns the product of two lists of residues modulo p, unreduced, by
+    Kronecker substitution
+
+    Both polynomials are evaluated at a power of two large enough for no
+    coefficient of the product to overflow into the next one, multiplied
+    as Python integers and unpacked again.
+    """
+    bound = min(len(a), len(b))*(p - 1)**2
+    width = (bound.bit_length() + 7) // 8 or 1
+    packed = _pack(a, width)*_pack(b, width)
+    length = len(a) + len(b) - 1
+    data = packed.to_bytes(length*width, "little")
+    return [int.from_bytes(data[i*width:(i+1)*width], "little")
+            for i in range(length)]
+
+def _pack(a: list, width: int) -> int:
+    return int.from_bytes(b"".join(c.to_bytes(width, "little") for c in a),
+                          "little")
+
+def _add_lists(a: list, b: list) -> list:
+    if len(a) < len(b):
+        a, b = b, a
+    return [a[i] + b[i] for i in range(len(b))] + a[len(b):]
+
+def poly_scale(a: list, c: int, p: int) -> list:
+    """Returns c * a mod p
+    """
+    c %= p
+    if c == 0:
+        return []
+    return [coeff*c % p for coeff in a]
+
+def poly_divmod(a: list, b: list, p: int):
+    """Returns quotient and remainder of a divided by b mod p
+
+    The leading coefficient of b is inverted once, so every step of the
+    long division is a multiplication instead of a modular inversion. From
+    NEWTON_DIVISION_THRESHOLD quotient coefficients the quotient is instead
+    computed from a Newton iteration reciprocal and fast multiplication.
+    """
+    if not b:
+        raise ZeroDivisionError("The divisor polynomial cannot be zero.")
+    deg_b = len(b) - 1
+    if len(a) <= deg_b:
+        return [], a[:]
+    if min(len(a) - deg_b, len(b)) >= NEWTON_DIVISION_THRESHOLD:
+        quotient = _newton_quotient(a, b, poly_reciprocal(b[::-1],
+                                                          len(a) - deg_b, p),
+                                    p)
+        return quotient, poly_sub(a, poly_mul(quotient, b, p), p)
+
+    lead_inv = pow(b[-1], -1, p)
+    remainder = a[:]
+    quotient = [0]*(len(a) - deg_b)
+    for i in range(len(a) - 1 - deg_b, -1, -1):
+        coeff = remainder[i + deg_b]*lead_inv % p
+        quotient[i] = coeff
+        if coeff:
+            for j in range(deg_b):
+                remainder[i + j] = (remainder[i + j] - coeff*b[j]) % p
+    return poly_trim(quotient), poly_trim(remainder[:deg_b])
+
+def poly_reciprocal(f: list, k: int, p: int) -> list:
+    """Returns the power series inverse of f modulo x^k over F_p, by Newton
+    iteration g <- g(2 - fg), doubling the precision at every step
+
+    The constant term of f must be nonzero.
+    """
+    g = [pow(f[0], -1, p)]
+    precision = 1
+    while precision < k:
+        precision = min(2*precision, k)
+        error = [-c % p for c in poly_mul(f[:precision], g, p)[:precision]]
+        error = error or [0]
+        error[0] = (error[0] + 2) % p
+        g = poly_mul(g, error, p)[:precision]
+    return g
+
+def _newton_quotient(a: list, b: list, reciprocal: list, p: int) -> list:
+    """Returns the quotient of a by b, given the reciprocal of the reversed
+    divisor to at least deg(a) - deg(b) + 1 terms
+    """
+    length = len(a) - len(b) + 1
+    quotient = poly_mul(a[::-1][:length], reciprocal[:length], p)[:length]
+    quotient += [0]*(length - len(quotient))
+    return poly_trim(quotient[::-1])
+
+
+class PrecomputedModulus:
+    """A fixed divisor f over F_p prepared for repeated reduction
+
+    The leading coefficient of f is inverted once. For large degrees the
+    reciprocal of the reversed f is also kept (Barrett reduction), so that
+    reducing a polynomial of degree below 2 deg(f) costs two
+    multiplications. The reciprocal is extended when longer dividends
+    show up.
+    """
+
+    def __init__(self, f: list, p: int):
+        f = poly_trim(f[:])
+        if not f:
+            raise ZeroDivisionError("The divisor polynomial cannot be zero.")
+        self.f = f
+        self.p = p
+        self.degree = len(f) - 1
+        self.lead_inv = pow(f[-1], -1, p)
+        self._reciprocal = [self.lead_inv]
+
+    def reciprocal(self, k: int) -> list:
+        """Returns the reciprocal of the reversed modulus to k terms
+        """
+        if len(self._reciprocal) < k:
+            self._reciprocal = poly_reciprocal(self.f[::-1], k, self.p)
+            self._reciprocal += [0]*(k - len(self._reciprocal))
+        return self._reciprocal
+
+    def divmod(self, a: list):
+        """Returns quotient and remainder of a divided by the modulus
+        """
+        deg = self.degree
+        p = self.p
+        if len(a) <= deg:
+            return [], poly_trim(a[:])
+        length = len(a) - deg
+        if min(length, deg + 1) >= NEWTON_DIVISION_THRESHOLD:
+            quotient = _newton_quotient(a, self.f, self.reciprocal(length), p)
+            return quotient, poly_sub(a, poly_mul(quotient, self.f, p), p)
+
+        f = self.f
+        lead_inv = self.lead_inv
+        remainder = a[:]
+        quotient = [0]*length
+        for i in range(length - 1, -1, -1):
+            coeff = remainder[i + deg]*lead_inv % p
+            quotient[i] = coeff
+            if coeff:
+                for j in range(deg):
+                    remainder[i + j] = (remainder[i + j] - coeff*f[j]) % p
+        return poly_trim(quotient), poly_trim(remainder[:deg])
+
+    def reduce(self, a: list) -> list:
+        """Returns a mod f
+        """
+        return self.divmod(a)[1]
+
+def poly_inverse_mod(a: list, f: list, p: int) -> list:
+    """Returns the inverse of a modulo f over F_p, using the extended
+    Euclidean algorithm
+
+    Raises ValueError if a and f are not coprime.
+    """
+    r0, r1 = f, poly_trim(a[:])
+    s0, s1 = [], [1]
+    while r1:
+        q, r = poly_divmod(r0, r1, p)
+        r0, r1 = r1, r
+        s0, s1 = s1, poly_sub(s0, poly_mul(q, s1, p), p)
+    if len(r0) != 1:
+        raise ValueError("Polynomials are not coprime")
+    return poly_scale(s0, pow(r0[0], -1, p), p)
+
+def poly_gcd(a: list, b: list, p: int) -> list:
+    """Returns the monic greatest common divisor of a and b mod p
+    """
+    a, b = poly_trim(a[:]), poly_trim(b[:])
+    while b:
+        a, b = b, poly_divmod(a, b, p)[1]
+    if not a:
+        return []
+    return poly_scale(a, pow(a[-1], -1, p), p)
+
+def poly_powmod(a: list, e: int, modulus: PrecomputedModulus) -> list:
+    """Returns a^e mod f for a PrecomputedModulus f, by square and multiply
+    """
+    p = modulus.p
+    result = [1] if modulus.degree else []
+    base = modulus.reduce(a)
+    while e:
+        if e & 1:
+            result = modulus.reduce(poly_mul(result, base, p))
+        e >>= 1
+        if e:
+            base = modulus.reduce(poly_mul(base, base, p))
+    return result
+
+def frobenius_rows(modulus: PrecomputedModulus) -> list:
+    """Returns the rows x^(ip) mod f for i < deg(f)
+
+    Since c^p = c for c in F_p, the Frobenius map h -> h^p mod f is linear,
+    and h^p is the sum of h_i times row i. Only x^p mod f needs a modular
+    exponentiation, the other rows are successive products.
+    """
+    p = modulus.p
+    x_p = poly_powmod([0, 1], p, modulus)
+    rows = [[1]]
+    for _ in range(1, modulus.degree):
+        rows.append(modulus.reduce(poly_mul(rows[-1], x_p, p)))
+    return rows
+
+def apply_frobenius(h: list, rows: list, p: int) -> list:
+    """Returns h^p mod f, given the rows of frobenius_rows(f)
+    """
+    result = [0]*len(rows)
+    for coeff, row in zip(h, rows):
+        if coeff:
+            for i, c in enumerate(row):
+                result[i] += coeff*c
+    return poly_trim([c % p for c in result])
+
+def poly_is_irreducible(f: list, p: int) -> bool:
+    """Returns True if f is irreducible over F_p, by Ben-Or's test
+
+    f is reducible exactly when it has an irreducible factor of some
+    degree k <= deg(f)/2, which shows up as a nontrivial
+    gcd(x^(p^k) - x, f). The test stops at the first factor found, and
+    random reducible polynomials usually have a small one. So x^(p^k) mod f
+    is first raised to the p-th power by modular exponentiation, one step
+    at a time. Only once these steps have cost about deg(f) products, as
+    much as building the Frobenius rows, are the rows built and used for
+    the remaining steps. Over F_2 the test runs on f packed into an
+    integer, with carry-less arithmetic.
+    """
+    f = poly_trim(f[:])
+    degree = len(f) - 1
+    if degree < 1:
+        return False
+    if degree == 1:
+        return True
+    if p == 2:
+        return binary_is_irreducible(int("".join(map(str, reversed(f))), 2))
+    modulus = PrecomputedModulus(poly_scale(f, pow(f[-1], -1, p), p), p)
+    rows = None
+    products = 0
+    h = [0, 1]
+    for _ in range(degree // 2):
+        if rows is None and products >= degree:
+            rows = frobenius_rows(modulus)
+        if rows is None:
+            h = poly_powmod(h, p, modulus)
+            products += 2*p.bit_length()
+        else:
+            h = apply_frobenius(h, rows, p)
+        if len(poly_gcd(modulus.f, poly_sub(h, [0, 1], p), p)) > 1:
+            return False
+    return True
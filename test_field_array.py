@@ -0,0 +1,16 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from FieldArray import FieldArray
+from FiniteFields import FiniteField
+
+
+def test_multiply_after_reduction_table_grows():
+    F = FiniteField(101, 3)
+    # Reducing a long vector caches rows beyond those a product needs
+    F([1]*10)
+    a = [F([1, 2, 3]), F([4, 0, 5]), F([0, 0, 1])]
+    b = [F([7, 1, 0]), F([3, 3, 3]), F([1, 100, 2])]
+    product = FieldArray(F, a)*FieldArray(F, b)
+    assert product.to_elements() == [x*y for x, y in zip(a, b)]
@@ -0,0 +1,20 @@
+from FiniteFields import FiniteField
+from Matrix import SparseMatrix
+
+
+def test_solve_leaves_matrix_unchanged():
+    F = FiniteField(3, 2)
+    S = SparseMatrix([[F([1, 0]), F([0, 0]), F([2, 1])],
+                      [F([0, 1]), F([1, 0]), F([1, 1])],
+                      [F([1, 1]), F([0, 1]), F([0, 0])]])
+    data = [dict(row) for row in S.data]
+    x = [F([1, 2]), F([0, 1]), F([2, 2])]
+    b = S*x
+    assert S*S.solve(b) == b
+    assert S.data == data
+
+def test_solve_leaves_float_matrix_unchanged():
+    S = SparseMatrix([[2.0, 1.0], [1.0, 3.0]])
+    data = [dict(row) for row in S.data]
+    assert S.solve([3.0, 4.0]) == [1.0, 1.0]
+    assert S.data == data